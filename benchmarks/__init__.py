@@ -0,0 +1 @@
+"""Offline load testing tools for the WPPConnect action."""
@@ -0,0 +1,20 @@
+"""Micro-benchmarks of outbound text formatting, which runs on every reply chunk."""
+
+from typing import Any, Callable
+
+import pytest
+
+from wppconnect_action.modules.formatting import sanitize_message
+
+MESSAGES = {
+    "plain": "Thanks for reaching out! Your order ships tomorrow. " * 4,
+    "markup": "**Order 123**<br/>Status: <b>shipped</b><br/>Total: **$42**. " * 4,
+    "long_markup": "**Heading**<br/>" + "A line of <b>bold</b> text.<br/>" * 200,
+}
+
+
+@pytest.mark.benchmark(group="sanitize_message")
+@pytest.mark.parametrize("message", MESSAGES)
+def bench_sanitize_message(bench: Callable[..., Any], message: str) -> None:
+    """Converts replies without markup, with some markup and long replies with markup."""
+    assert bench(sanitize_message, MESSAGES[message])
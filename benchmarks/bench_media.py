@@ -0,0 +1,53 @@
+"""Micro-benchmarks of media type detection and media download encoding."""
+
+from typing import Any, Callable, Dict, Type, Union
+
+import pytest
+
+from wppconnect_action.modules.wppconnect_api import WPPConnectAPI
+from wppconnect_action.modules.wwebjs_api import WWebJSAPI
+
+from .inputs import MEDIA_SIZES
+
+CLIENTS: Dict[str, Union[Type[WPPConnectAPI], Type[WWebJSAPI]]] = {
+    "wppconnect": WPPConnectAPI,
+    "wwebjs": WWebJSAPI,
+}
+
+
+@pytest.mark.benchmark(group="get_file_type")
+@pytest.mark.parametrize("flavor", CLIENTS)
+@pytest.mark.parametrize(
+    "source",
+    [
+        {"mime_type": "image/jpeg"},
+        {"mime_type": "application/vnd.unknown"},
+        {"file_path": "report.pdf"},
+        {"file_path": "voice.opus"},
+    ],
+    ids=["mime", "unknown_mime", "path", "unknown_path"],
+)
+def bench_get_file_type(bench: Callable[..., Any], flavor: str, source: dict) -> None:
+    """Classifies media by mime type or file name."""
+    assert bench(CLIENTS[flavor].get_file_type, **source)
+
+
+@pytest.mark.benchmark(group="get_file_type_url")
+def bench_get_file_type_url(
+    bench: Callable[..., Any], media_server: Callable[[str], str]
+) -> None:
+    """Classifies media by URL, which makes a HEAD request to a local server."""
+    assert bench(WPPConnectAPI.get_file_type, url=media_server("1MB"))
+
+
+@pytest.mark.benchmark(group="file_url_to_base64")
+@pytest.mark.parametrize("flavor", CLIENTS)
+@pytest.mark.parametrize("size", MEDIA_SIZES)
+def bench_file_url_to_base64(
+    bench: Callable[..., Any],
+    media_server: Callable[[str], str],
+    flavor: str,
+    size: str,
+) -> None:
+    """Downloads media from a local server and base64 encodes it with a data URI prefix."""
+    assert bench(CLIENTS[flavor].file_url_to_base64, media_server(size))
@@ -0,0 +1,46 @@
+"""Micro-benchmarks of inbound webhook parsing, which runs on every message."""
+
+from typing import Any, Callable, Dict, Type, Union
+
+import pytest
+
+from wppconnect_action.modules.wppconnect_api import WPPConnectAPI
+from wppconnect_action.modules.wwebjs_api import WWebJSAPI
+
+from .inputs import MEDIA_SIZES, webhook
+
+CLIENTS: Dict[str, Union[Type[WPPConnectAPI], Type[WWebJSAPI]]] = {
+    "wppconnect": WPPConnectAPI,
+    "wwebjs": WWebJSAPI,
+}
+
+
+@pytest.mark.benchmark(group="parse_inbound_message")
+@pytest.mark.parametrize("flavor", CLIENTS)
+@pytest.mark.parametrize("kind", ["chat", "mention", "location", "poll"])
+def bench_parse_inbound_message(
+    bench: Callable[..., Any], flavor: str, kind: str
+) -> None:
+    """Parses text and structured messages."""
+    payload = webhook(flavor, kind)
+    assert bench(CLIENTS[flavor].parse_inbound_message, payload)
+
+
+@pytest.mark.benchmark(group="parse_inbound_message_media")
+@pytest.mark.parametrize("flavor", CLIENTS)
+@pytest.mark.parametrize("size", MEDIA_SIZES)
+def bench_parse_inbound_media(
+    bench: Callable[..., Any], flavor: str, size: str
+) -> None:
+    """Parses image messages carrying media bodies of increasing size."""
+    payload = webhook(flavor, "image", MEDIA_SIZES[size])
+    assert bench(CLIENTS[flavor].parse_inbound_message, payload)
+
+
+@pytest.mark.benchmark(group="translate_wwebjs_to_wppconnect")
+@pytest.mark.parametrize("size", ["0", *MEDIA_SIZES])
+def bench_translate_wwebjs_to_wppconnect(bench: Callable[..., Any], size: str) -> None:
+    """Translates WWebJS chat ("0") and image payloads to the WPPConnect format."""
+    kind = "image" if size in MEDIA_SIZES else "chat"
+    payload = webhook("wwebjs", kind, MEDIA_SIZES.get(size, 0))
+    assert bench(WWebJSAPI.translate_wwebjs_to_wppconnect, payload)
@@ -0,0 +1,72 @@
+"""Shared inputs and helpers of the micro-benchmarks."""
+
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator
+
+import pytest
+
+from .inputs import MEDIA_SIZES, media_body
+
+
+@pytest.fixture(scope="session")
+def media_server() -> Iterator[Callable[[str], str]]:
+    """Serves media bodies over HTTP; yields a function returning the URL of a MEDIA_SIZES key."""
+    bodies: Dict[str, bytes] = {
+        f"/{name}.jpg": media_body(size) for name, size in MEDIA_SIZES.items()
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _headers(self) -> bytes:
+            body = bodies.get(self.path, b"")
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            return body
+
+        def do_HEAD(self) -> None:  # noqa: N802
+            self._headers()
+
+        def do_GET(self) -> None:  # noqa: N802
+            self.wfile.write(self._headers())
+
+        def log_message(self, *args: Any) -> None:  # noqa: ANN401
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield lambda name: f"{base_url}/{name}.jpg"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def bench(benchmark: Any) -> Callable[..., Any]:  # noqa: ANN401
+    """
+    Wraps the benchmark fixture to also record the peak memory allocated by one call.
+
+    The peak is measured in a separate untimed call, since tracing allocations slows every
+    call down, and saved as peak_alloc_kb in the benchmark's extra_info.
+    """
+
+    def run(
+        function: Callable[..., Any],
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        tracemalloc.start()
+        try:
+            function(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_alloc_kb"] = round(peak / 1024, 1)
+        return benchmark(function, *args, **kwargs)
+
+    return run
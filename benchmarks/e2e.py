@@ -0,0 +1,411 @@
+"""
+End-to-end throughput and latency benchmark of the wppconnect_interact webhook.
+
+Replays recorded webhook payloads (chat, media, ptt, poll, location, group mentions and LID
+senders) against a running JIVAS server whose WPPConnect action is pointed at a mock gateway
+started by this runner. Reports messages per second, webhook latency percentiles, gateway
+calls per message and peak RSS, saves the results as JSON and compares them with a baseline.
+
+    python -m benchmarks.e2e --webhook-url <url> --session <session> --server-pid <pid>
+
+Pass --baseline <results.json> to compare the run with an earlier one.
+
+The action's api_url must be set to the gateway URL printed at start-up. For a measurement of
+the action itself, run the agent without model actions so interact returns immediately.
+"""
+
+import argparse
+import base64
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from .mock_gateway import (
+    MESSAGE_KINDS,
+    WPPCONNECT,
+    WWEBJS,
+    MockGateway,
+    message_event,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# placeholders substituted into the recorded payloads on every replay
+SESSION = "__SESSION__"
+SENDER = "__SENDER__"
+RECEIVER = "__RECEIVER__"
+MESSAGE_ID = "__MESSAGE_ID__"
+MEDIA = "__MEDIA__"
+
+# metrics compared with a baseline, and whether a higher value is better
+COMPARED_METRICS = {
+    "messages_per_second": True,
+    "latency_ms.p50": False,
+    "latency_ms.p95": False,
+    "latency_ms.p99": False,
+    "gateway_calls_per_message": False,
+    "peak_rss_mb.server": False,
+}
+
+# result keys printed after a run
+SUMMARY_KEYS = (
+    "messages_per_second",
+    "latency_ms",
+    "gateway_calls_per_message",
+    "responses",
+    "peak_rss_mb",
+)
+
+
+def fixture_path(flavor: str) -> str:
+    """Returns the path of the recorded webhook payloads of a gateway flavor."""
+    return os.path.join(FIXTURES_DIR, f"webhooks_{flavor}.json")
+
+
+def record_fixtures(flavor: str) -> List[dict]:
+    """Builds the webhook payloads of every message kind, plus a chat from a LID sender."""
+    fixtures = []
+    cases = [(kind, kind, False) for kind in MESSAGE_KINDS] + [("lid", "chat", True)]
+    for name, kind, lid in cases:
+        payload = message_event(
+            flavor,
+            SESSION,
+            kind,
+            sender=SENDER,
+            receiver=RECEIVER,
+            body="Hello from the benchmark" if kind != "poll" else "Yes",
+            lid=lid,
+        )
+        text = json.dumps(payload)
+        message_id = payload.get("id") or payload.get("data", {}).get(
+            "message", {}
+        ).get("_data", {}).get("id", {}).get("_serialized")
+        if message_id:
+            # the random suffix of the id is replaced, so every replay is a new message
+            text = text.replace(message_id[-20:], MESSAGE_ID)
+        placeholder = base64.b64encode(b"\0" * 1024).decode()
+        fixtures.append(
+            {"name": name, "payload": json.loads(text.replace(placeholder, MEDIA))}
+        )
+    return fixtures
+
+
+def load_fixtures(flavor: str, kinds: Optional[List[str]] = None) -> List[dict]:
+    """Loads the recorded payloads of a flavor, optionally only those named in kinds."""
+    with open(fixture_path(flavor)) as f:
+        fixtures = json.load(f)
+    if kinds:
+        fixtures = [fixture for fixture in fixtures if fixture["name"] in kinds]
+    if not fixtures:
+        raise ValueError(f"no recorded {flavor} webhooks match {kinds}")
+    return fixtures
+
+
+def render(
+    fixture: dict, session: str, sender: str, receiver: str, media: str
+) -> bytes:
+    """Returns the request body of a recorded payload with its placeholders filled in."""
+    text = json.dumps(fixture["payload"])
+    for placeholder, value in (
+        (SESSION, session),
+        (SENDER, sender),
+        (RECEIVER, receiver),
+        (MESSAGE_ID, uuid.uuid4().hex[:20].upper()),
+        (MEDIA, media),
+    ):
+        text = text.replace(placeholder, value)
+    return text.encode("utf-8")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Returns the q-th percentile of values, for q from 0 to 100, interpolating between ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def peak_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Returns the peak resident set size of a process in MB; this process if pid is None."""
+    if pid is None:
+        # ru_maxrss is in KB on Linux and bytes on macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+    with contextlib.suppress(OSError), open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    return None
+
+
+def wait_until_quiet(gateway: MockGateway, quiet: float, timeout: float) -> None:
+    """Waits until the gateway has received no calls for quiet seconds, e.g. background sends."""
+    deadline = time.monotonic() + timeout
+    last_calls, last_change = -1, time.monotonic()
+    while time.monotonic() < deadline:
+        calls = gateway.snapshot()["total_calls"]
+        if calls != last_calls:
+            last_calls, last_change = calls, time.monotonic()
+        elif time.monotonic() - last_change >= quiet:
+            return
+        time.sleep(0.1)
+
+
+def replay(
+    webhook_url: str,
+    bodies: List[bytes],
+    concurrency: int,
+    timeout: float,
+) -> Tuple[List[float], Dict[str, int], float]:
+    """
+    Posts the request bodies to the webhook with concurrency parallel clients.
+
+    :return: per-request latencies in ms, counts of response statuses and the elapsed seconds.
+    """
+    local = threading.local()
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def post(body: bytes) -> float:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            response = local.session.post(
+                webhook_url,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                timeout=timeout,
+            )
+            status = str(response.status_code)
+        except requests.RequestException as e:
+            status = type(e).__name__
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+        return elapsed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(post, bodies))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Runs the benchmark described by the command line arguments and returns its results."""
+    fixtures = load_fixtures(args.flavor, args.kinds)
+    rng = random.Random(args.seed)
+    media = base64.b64encode(rng.randbytes(args.media_size)).decode()
+
+    def bodies(count: int) -> List[bytes]:
+        return [
+            render(
+                fixtures[index % len(fixtures)],
+                session=args.session,
+                sender=f"1555{rng.randrange(args.users):07d}",
+                receiver=args.receiver,
+                media=media,
+            )
+            for index in range(count)
+        ]
+
+    gateway = MockGateway(
+        flavor=args.flavor,
+        host=args.gateway_host,
+        port=args.gateway_port,
+        secret_key=args.secret_key,
+        phone=args.receiver,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        send_rate=args.send_rate,
+        seed=args.seed,
+    ).start()
+    print(f"mock {args.flavor} gateway serving at {gateway.api_url}", file=sys.stderr)
+    try:
+        if args.warmup:
+            replay(
+                args.webhook_url, bodies(args.warmup), args.concurrency, args.timeout
+            )
+            wait_until_quiet(gateway, args.settle, args.settle_timeout)
+        gateway.reset_stats()
+
+        latencies, statuses, elapsed = replay(
+            args.webhook_url, bodies(args.messages), args.concurrency, args.timeout
+        )
+        wait_until_quiet(gateway, args.settle, args.settle_timeout)
+        stats = gateway.snapshot()
+    finally:
+        gateway.stop()
+
+    return {
+        "name": args.name,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": environment(),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "baseline", "record")
+        },
+        "messages": args.messages,
+        "elapsed_s": round(elapsed, 3),
+        "messages_per_second": round(args.messages / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(max(latencies, default=0.0), 2),
+        },
+        "responses": statuses,
+        "gateway_calls_per_message": round(stats["total_calls"] / args.messages, 3),
+        "gateway": stats,
+        "peak_rss_mb": {
+            "runner": peak_rss_mb(),
+            "server": peak_rss_mb(args.server_pid) if args.server_pid else None,
+        },
+    }
+
+
+def environment() -> dict:
+    """Returns the interpreter, platform and commit the benchmark ran on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(__file__),
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def metric(results: dict, path: str) -> Optional[float]:
+    """Returns the value of a dotted metric path in results, or None if it is missing."""
+    value = results
+    for part in path.split("."):
+        if not isinstance(value, dict) or value.get(part) is None:
+            return None
+        value = value[part]
+    return float(value)  # type: ignore[arg-type]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[dict]:
+    """
+    Compares results with a baseline run.
+
+    :param tolerance: relative change in the worse direction tolerated before a metric regresses.
+    :return: one row per metric present in both runs, with its change and regression flag.
+    """
+    rows = []
+    for path, higher_is_better in COMPARED_METRICS.items():
+        current, previous = metric(results, path), metric(baseline, path)
+        if current is None or previous is None:
+            continue
+        change = (current - previous) / previous if previous else 0.0
+        worse = -change if higher_is_better else change
+        rows.append(
+            {
+                "metric": path,
+                "baseline": previous,
+                "current": current,
+                "change": round(change, 4),
+                "regressed": worse > tolerance,
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the benchmark, or records the fixtures; returns 1 if a metric regressed."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--flavor", choices=[WPPCONNECT, WWEBJS], default=WPPCONNECT)
+    parser.add_argument(
+        "--record", action="store_true", help="rewrite the recorded webhook fixtures"
+    )
+    parser.add_argument("--webhook-url", help="the action's wppconnect_interact URL")
+    parser.add_argument("--session", default="", help="the action's gateway session")
+    parser.add_argument("--receiver", default="15550000000", help="the agent's number")
+    parser.add_argument("--kinds", nargs="*", help="replay only these fixtures")
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--users", type=int, default=200, help="distinct senders")
+    parser.add_argument("--media-size", type=int, default=64 * 1024)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--settle", type=float, default=2.0)
+    parser.add_argument("--settle-timeout", type=float, default=60.0)
+    parser.add_argument("--gateway-host", default="127.0.0.1")
+    parser.add_argument("--gateway-port", type=int, default=21465)
+    parser.add_argument("--secret-key", default="THISISMYSECURETOKEN")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--send-rate", type=float, default=0.0)
+    parser.add_argument("--server-pid", type=int, help="JIVAS server pid, for its RSS")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--name", default="e2e")
+    parser.add_argument("--output", help="results file; defaults to benchmarks/results")
+    parser.add_argument("--baseline", help="results file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.record:
+        os.makedirs(FIXTURES_DIR, exist_ok=True)
+        with open(fixture_path(args.flavor), "w") as f:
+            json.dump(record_fixtures(args.flavor), f, indent=2)
+            f.write("\n")
+        print(f"recorded {fixture_path(args.flavor)}")
+        return 0
+    if not args.webhook_url or not args.session:
+        parser.error("--webhook-url and --session are required to run the benchmark")
+
+    results = run(args)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{args.name}-{args.flavor}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({key: results[key] for key in SUMMARY_KEYS}, indent=2))
+    print(f"results saved to {output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        rows = compare(results, json.load(f), args.tolerance)
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else "ok"
+        print(
+            f"{row['metric']:<28} {row['baseline']:>12.2f} -> {row['current']:>12.2f} "
+            f"({row['change']:+.1%}) {flag}"
+        )
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
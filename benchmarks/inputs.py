@@ -0,0 +1,33 @@
+"""Representative inputs of the micro-benchmarks."""
+
+import os
+
+from .mock_gateway import WPPCONNECT, WWEBJS, message_event
+
+FLAVORS = (WPPCONNECT, WWEBJS)
+
+# media body sizes exercised by the benchmarks, from a thumbnail to a multi-MB video
+MEDIA_SIZES = {"1KB": 1024, "1MB": 1024 * 1024, "5MB": 5 * 1024 * 1024}
+
+# leading bytes which let filetype recognise the random media bodies
+MEDIA_SIGNATURES = {
+    "image/jpeg": b"\xff\xd8\xff\xe0\x00\x10JFIF\x00",
+    "application/pdf": b"%PDF-1.7\n",
+    "audio/ogg": b"OggS\x00\x02",
+}
+
+
+def media_body(size: int, mime_type: str = "image/jpeg") -> bytes:
+    """Returns size bytes of incompressible media content starting with the mime type's signature."""
+    signature = MEDIA_SIGNATURES.get(mime_type, b"")
+    return signature + os.urandom(max(size - len(signature), 0))
+
+
+def webhook(flavor: str, kind: str, size: int = 0) -> dict:
+    """Returns an inbound webhook payload of a message kind, with a media body of size bytes."""
+    return message_event(
+        flavor,
+        "bench",
+        kind,
+        media=media_body(size) if size else None,
+    )
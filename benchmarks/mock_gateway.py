@@ -0,0 +1,882 @@
+"""
+Local stand-in for a WPPConnect or WWebJS gateway, for load testing the action offline.
+
+Serves the endpoints used by modules/wppconnect_api.py and modules/wwebjs_api.py with
+configurable latency, error, timeout and throttling behaviour, counts the calls it receives,
+and emits the webhooks a gateway sends (session state changes and inbound messages) to the
+webhook URL registered by the action.
+
+Run it in place of a gateway with:
+
+    python -m benchmarks.mock_gateway --flavor wppconnect --port 21465 --latency 0.05
+
+and point the action's api_url at it (http://127.0.0.1:21465/api for WPPConnect, or
+http://127.0.0.1:21465 for WWebJS with api_is_wwebjs set).
+"""
+
+import argparse
+import base64
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+WPPCONNECT = "wppconnect"
+WWEBJS = "wwebjs"
+
+# 1x1 PNG served as the session QR code image
+QR_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+# message kinds message_event can build
+MESSAGE_KINDS = ("chat", "image", "document", "ptt", "location", "poll", "mention")
+
+# WPPConnect status-find values reported for each session status
+WPPCONNECT_STATUS_EVENTS = {
+    "CONNECTED": "isLogged",
+    "QRCODE": "notLogged",
+    "DISCONNECTED": "desconnectedMobile",
+    "CLOSED": "browserClose",
+}
+
+# WWebJS client events reported for each session status
+WWEBJS_STATUS_EVENTS = {
+    "CONNECTED": "ready",
+    "QRCODE": "qr",
+    "DISCONNECTED": "disconnected",
+}
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def json_response(
+    status_code: int, body: Any, headers: Optional[dict] = None  # noqa: ANN401
+) -> Response:
+    """Returns a JSON response tuple of status code, headers and body."""
+    return (
+        status_code,
+        {"Content-Type": "application/json", **(headers or {})},
+        json.dumps(body).encode("utf-8"),
+    )
+
+
+def new_message_id(chat_id: str, from_me: bool = False) -> str:
+    """Returns a serialized WhatsApp message id for a message in chat_id."""
+    return f"{str(from_me).lower()}_{chat_id}_{uuid.uuid4().hex[:20].upper()}"
+
+
+def session_event(flavor: str, session: str, status: str) -> dict:
+    """Returns the session-state webhook payload a gateway sends when a session reaches status."""
+    if flavor == WWEBJS:
+        data_type = WWEBJS_STATUS_EVENTS.get(status)
+        if data_type == "qr":
+            return {
+                "sessionId": session,
+                "dataType": "qr",
+                "data": {"qr": f"2@{uuid.uuid4().hex}"},
+            }
+        if data_type:
+            return {"sessionId": session, "dataType": data_type, "data": {}}
+        return {
+            "sessionId": session,
+            "dataType": "change_state",
+            "data": {"state": status},
+        }
+    if status == "QRCODE":
+        return {
+            "event": "qrcode",
+            "session": session,
+            "qrcode": "data:image/png;base64," + base64.b64encode(QR_PNG).decode(),
+            "urlcode": f"2@{uuid.uuid4().hex}",
+        }
+    return {
+        "event": "status-find",
+        "session": session,
+        "status": WPPCONNECT_STATUS_EVENTS.get(status, status),
+    }
+
+
+def message_event(
+    flavor: str,
+    session: str,
+    kind: str = "chat",
+    sender: str = "15551230000",
+    receiver: str = "15550000000",
+    body: str = "Hello",
+    media: Optional[bytes] = None,
+    mime_type: str = "",
+    filename: str = "",
+    group_id: str = "120363000000000000",
+    lid: bool = False,
+    sender_name: str = "Load Test",
+) -> dict:
+    """
+    Returns an inbound message webhook payload as the gateway would send it.
+
+    :param kind: one of MESSAGE_KINDS; "mention" is a group message tagging the receiver and
+        "poll" is a vote on a poll sent by the receiver.
+    :param media: content of image, document and ptt messages; a small placeholder by default.
+    :param lid: identify the sender by a WhatsApp LID instead of a phone number.
+    """
+    if kind not in MESSAGE_KINDS:
+        raise ValueError(
+            f"unknown message kind {kind}, expected one of {MESSAGE_KINDS}"
+        )
+
+    sender_id = f"{sender}@lid" if lid else f"{sender}@c.us"
+    receiver_id = f"{receiver}@c.us"
+    chat_id, author = sender_id, ""
+    message_type = kind
+    if kind == "mention":
+        chat_id, author = f"{group_id}@g.us", sender_id
+        message_type = "chat"
+        body = f"@{receiver} {body}"
+    defaults = {
+        "image": ("image/jpeg", "photo.jpg"),
+        "document": ("application/pdf", "report.pdf"),
+        "ptt": ("audio/ogg; codecs=opus", ""),
+    }
+    if kind in defaults:
+        mime_type = mime_type or defaults[kind][0]
+        filename = filename or defaults[kind][1]
+    encoded = (
+        base64.b64encode(media or b"\0" * 1024).decode() if kind in defaults else ""
+    )
+    message_id = new_message_id(chat_id)
+    timestamp = int(time.time())
+
+    if flavor == WWEBJS:
+        return _wwebjs_message(
+            session,
+            kind,
+            message_type,
+            message_id,
+            chat_id,
+            author,
+            receiver_id,
+            body,
+            encoded,
+            mime_type,
+            filename,
+            timestamp,
+            sender_name,
+        )
+
+    if kind == "poll":
+        return {
+            "event": "onpollresponse",
+            "session": session,
+            "msgId": {"_serialized": new_message_id(chat_id, from_me=True)},
+            "chatId": chat_id,
+            "sender": sender_id,
+            "selectedOptions": [{"name": body, "localId": 0}],
+            "timestamp": timestamp,
+        }
+    payload: Dict[str, Any] = {
+        "event": "onmessage",
+        "session": session,
+        "id": message_id,
+        "type": message_type,
+        "from": chat_id,
+        "to": receiver_id,
+        "author": author,
+        "fromMe": False,
+        "isGroupMsg": bool(author),
+        "isForwarded": False,
+        "notifyName": sender_name,
+        "t": timestamp,
+    }
+    if kind == "location":
+        payload.update(lat=-33.9249, lng=18.4241)
+    elif encoded:
+        payload.update(body=encoded, mimetype=mime_type, filename=filename)
+        if kind != "ptt":
+            payload["caption"] = body
+    else:
+        payload.update(body=body, content=body)
+    return payload
+
+
+def _wwebjs_message(
+    session: str,
+    kind: str,
+    message_type: str,
+    message_id: str,
+    chat_id: str,
+    author: str,
+    receiver_id: str,
+    body: str,
+    encoded: str,
+    mime_type: str,
+    filename: str,
+    timestamp: int,
+    sender_name: str,
+) -> dict:
+    msg_data: Dict[str, Any] = {
+        "id": {"fromMe": False, "_serialized": message_id, "id": message_id[-20:]},
+        "type": message_type,
+        "body": "" if encoded and kind == "ptt" else body,
+        "t": timestamp,
+        "notifyName": sender_name,
+        "from": chat_id,
+        "to": receiver_id,
+        "author": author,
+        "mentionedJidList": [receiver_id] if kind == "mention" else [],
+    }
+    if encoded and kind != "ptt":
+        msg_data["caption"] = body
+    if kind == "poll":
+        parent_id = new_message_id(chat_id, from_me=True)
+        parent = {
+            "_data": {
+                "id": {"fromMe": True, "_serialized": parent_id, "id": parent_id[-20:]},
+                "from": chat_id,
+                "to": receiver_id,
+                "type": "poll_creation",
+            },
+            "from": receiver_id,
+            "to": chat_id,
+        }
+        return {
+            "sessionId": session,
+            "dataType": "vote_update",
+            "data": {
+                "vote": {
+                    "voter": chat_id,
+                    "selectedOptions": [{"name": body, "localId": 0}],
+                    "parentMessage": parent,
+                    "interractedAtTs": timestamp * 1000,
+                }
+            },
+        }
+    message: Dict[str, Any] = {"_data": msg_data, "type": message_type}
+    if kind == "location":
+        message["location"] = {"latitude": -33.9249, "longitude": 18.4241}
+    data: Dict[str, Any] = {"message": message}
+    if encoded:
+        data["messageMedia"] = {
+            "mimetype": mime_type,
+            "data": encoded,
+            "filename": filename,
+        }
+    return {
+        "sessionId": session,
+        "dataType": "media" if encoded else "message",
+        "data": data,
+    }
+
+
+class SendBucket:
+    """Token bucket admitting at most rate sends per second, in bursts of up to one second's worth."""
+
+    def __init__(self, rate: float) -> None:
+        """
+        Initializes a full bucket.
+
+        :param rate: sends per second; 0 admits every send.
+        """
+        self.rate = rate
+        self.tokens = max(rate, 1.0)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Takes a token; returns False if the send must be throttled."""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                max(self.rate, 1.0), self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class MockGateway:
+    """
+    WPPConnect or WWebJS gateway stand-in served on a background thread.
+
+    Each request is delayed by latency plus up to jitter seconds, then may be stalled past the
+    client's timeout (timeout_rate), failed with HTTP 500 (error_rate), or, for sends, throttled
+    with HTTP 429 (throttle_rate, or beyond send_rate sends per second). Calls are counted per
+    endpoint, sent messages are recorded, and session-state webhooks are emitted as the session
+    status changes.
+    """
+
+    def __init__(
+        self,
+        flavor: str = WPPCONNECT,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        secret_key: str = "THISISMYSECURETOKEN",  # pragma: allowlist secret
+        status: str = "CONNECTED",
+        phone: str = "15550000000",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        timeout_delay: float = 30.0,
+        throttle_rate: float = 0.0,
+        send_rate: float = 0.0,
+        group_size: int = 8,
+        webhook_url: str = "",
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initializes the gateway; call start to serve it.
+
+        :param flavor: WPPCONNECT or WWEBJS, the API to serve.
+        :param port: port to listen on; 0 picks a free one.
+        :param status: initial status of every session.
+        :param phone: phone number of the host device.
+        :param latency: seconds every request is delayed.
+        :param jitter: up to this many seconds are added to latency at random.
+        :param error_rate: fraction of requests failed with HTTP 500.
+        :param timeout_rate: fraction of requests stalled for timeout_delay seconds.
+        :param throttle_rate: fraction of sends rejected with HTTP 429.
+        :param send_rate: sends per second accepted before throttling; 0 is unlimited.
+        :param group_size: number of members reported for any group.
+        :param webhook_url: where webhooks are sent until a session is started with its own.
+        :param seed: seeds the random behaviour, for repeatable runs.
+        """
+        if flavor not in (WPPCONNECT, WWEBJS):
+            raise ValueError(f"unknown gateway flavor {flavor}")
+        self.flavor = flavor
+        self.host = host
+        self.port = port
+        self.secret_key = secret_key
+        self.default_status = status
+        self.phone = phone
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_delay = timeout_delay
+        self.throttle_rate = throttle_rate
+        self.group_size = group_size
+        self.webhook_url = webhook_url
+        self.bucket = SendBucket(send_rate)
+        self.random = random.Random(seed)
+        self.sessions: Dict[str, dict] = {}
+        self.tokens: Dict[str, str] = {}
+        self.calls: Counter = Counter()
+        self.faults: Counter = Counter()
+        self.sent: Deque[dict] = deque(maxlen=10000)
+        self.webhooks: Counter = Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- lifecycle
+
+    def start(self) -> "MockGateway":
+        """Starts serving on a background thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), MockGatewayHandler)
+        self._server.daemon_threads = True
+        self._server.gateway = self  # type: ignore[attr-defined]
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-gateway", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockGateway":
+        """Starts the gateway for the duration of a with block."""
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        """Stops the gateway at the end of a with block."""
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Returns the base URL of the server."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def api_url(self) -> str:
+        """Returns the api_url the action should use for this gateway."""
+        return f"{self.url}/api" if self.flavor == WPPCONNECT else self.url
+
+    # ---- sessions and webhooks
+
+    def session(self, name: str) -> dict:
+        """Returns the state of a session, creating it with the initial status on first use."""
+        with self._lock:
+            if name not in self.sessions:
+                self.sessions[name] = {
+                    "status": self.default_status,
+                    "webhook": self.webhook_url,
+                }
+            return self.sessions[name]
+
+    def set_status(self, name: str, status: str, notify: bool = True) -> None:
+        """Sets the status of a session, emitting its session-state webhook."""
+        session = self.session(name)
+        session["status"] = status
+        if notify:
+            self.emit_async(session_event(self.flavor, name, status), session)
+
+    def scan(self, name: str) -> None:
+        """Simulates scanning the session's QR code, connecting it."""
+        self.set_status(name, "CONNECTED")
+
+    def emit(self, payload: dict, session: Optional[dict] = None) -> int:
+        """
+        Posts a webhook payload to the session's webhook URL.
+
+        :return: the HTTP status of the response, or 0 if it could not be delivered.
+        """
+        session_name = payload.get("session") or payload.get("sessionId") or ""
+        session = session or self.session(session_name)
+        url = session.get("webhook") or self.webhook_url
+        if not url:
+            return 0
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except (urllib.error.URLError, OSError):
+            status = 0
+        self.webhooks["delivered" if 200 <= status < 300 else "failed"] += 1
+        return status
+
+    def emit_async(self, payload: dict, session: Optional[dict] = None) -> None:
+        """Posts a webhook payload from a background thread, as gateways do."""
+        threading.Thread(target=self.emit, args=(payload, session), daemon=True).start()
+
+    # ---- stats
+
+    def snapshot(self) -> dict:
+        """Returns the calls per endpoint, injected faults, sends and webhook deliveries so far."""
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "total_calls": sum(self.calls.values()),
+                "faults": dict(self.faults),
+                "sent": len(self.sent),
+                "webhooks": dict(self.webhooks),
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+            }
+
+    def reset_stats(self) -> None:
+        """Clears the counters and the record of sent messages."""
+        with self._lock:
+            self.calls.clear()
+            self.faults.clear()
+            self.sent.clear()
+            self.webhooks.clear()
+            self.bytes_in = self.bytes_out = 0
+
+    # ---- request handling
+
+    def handle(
+        self, method: str, path: str, headers: Dict[str, str], body: bytes
+    ) -> Response:
+        """Applies the configured faults to a request, then answers it like the gateway would."""
+        path = path.split("?", 1)[0]
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            data = {}
+        route, session, send = self.classify(path)
+        with self._lock:
+            self.calls[route] += 1
+            self.bytes_in += len(body)
+
+        delay = self.latency + (
+            self.random.uniform(0, self.jitter) if self.jitter else 0
+        )
+        if delay > 0:
+            time.sleep(delay)
+        if self.timeout_rate and self.random.random() < self.timeout_rate:
+            self._fault("timeout")
+            time.sleep(self.timeout_delay)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self._fault("error")
+            return json_response(500, {"status": "error", "message": "Internal error"})
+        if send and (
+            (self.throttle_rate and self.random.random() < self.throttle_rate)
+            or not self.bucket.take()
+        ):
+            self._fault("throttle")
+            return json_response(
+                429, {"error": "rate-overlimit"}, headers={"Retry-After": "1"}
+            )
+
+        router = self.route_wwebjs if self.flavor == WWEBJS else self.route_wppconnect
+        response = router(route, session, send, path, headers, data)
+        with self._lock:
+            self.bytes_out += len(response[2])
+        return response
+
+    def classify(self, path: str) -> Tuple[str, str, bool]:
+        """Returns the endpoint name, session name and whether a request path is a send."""
+        parts = [part for part in path.split("/") if part]
+        if self.flavor == WWEBJS:
+            if len(parts) >= 3:
+                if parts[0] == "session" and parts[1] == "qr":
+                    return "session/qr", parts[2], False
+                route = f"{parts[0]}/{parts[1]}"
+                return route, parts[2], route == "client/sendMessage"
+            return "/".join(parts), "", False
+        # WPPConnect: /api/{session}/{endpoint}[/{id}], /api/{session}/{secret}/generate-token
+        parts = parts[1:] if parts[:1] == ["api"] else parts
+        if len(parts) == 2 and parts[1] == "show-all-sessions":
+            return "show-all-sessions", "", False
+        if len(parts) == 3 and parts[2] == "generate-token":
+            return "generate-token", parts[0], False
+        if len(parts) >= 2:
+            return parts[1], parts[0], parts[1].startswith("send-")
+        return "/".join(parts), "", False
+
+    def _fault(self, kind: str) -> None:
+        with self._lock:
+            self.faults[kind] += 1
+
+    def _record_send(self, session: str, data: dict) -> str:
+        chat_id = str(data.get("phone") or data.get("chatId") or "")
+        message_id = new_message_id(chat_id, from_me=True)
+        with self._lock:
+            self.sent.append({"session": session, "id": message_id, "data": data})
+        return message_id
+
+    def _group_members(self, group_id: str) -> List[str]:
+        members = [f"1555{index:07d}" for index in range(1, self.group_size)]
+        return [self.phone] + members
+
+    def route_wppconnect(
+        self,
+        route: str,
+        session: str,
+        send: bool,
+        path: str,
+        headers: Dict[str, str],
+        data: dict,
+    ) -> Response:
+        """Answers a WPPConnect API request."""
+        if route == "show-all-sessions":
+            return json_response(200, {"response": list(self.sessions)})
+        if route == "generate-token":
+            if f"/{self.secret_key}/" not in path:
+                return json_response(400, {"message": "The SECRET_KEY is incorrect"})
+            token = f"$2b$10${uuid.uuid4().hex}"
+            with self._lock:
+                self.tokens[session] = token
+            return json_response(
+                201,
+                {
+                    "status": "success",
+                    "session": session,
+                    "token": token,
+                    "full": f"{session}:{token}",
+                },
+            )
+        # sessions without a generated token accept any token, like a pre-seeded gateway
+        token = headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        expected = self.tokens.get(session)
+        if not token or (expected and token != expected):
+            return json_response(
+                401, {"message": "Unauthorized", "error": "Unauthorized"}
+            )
+
+        state = self.session(session)
+        if route == "status-session":
+            qrcode = (
+                "data:image/png;base64," + base64.b64encode(QR_PNG).decode()
+                if state["status"] == "QRCODE"
+                else None
+            )
+            return json_response(
+                200, {"status": state["status"], "qrcode": qrcode, "version": "mock"}
+            )
+        if route == "check-connection-session":
+            connected = state["status"] == "CONNECTED"
+            return json_response(
+                200,
+                {
+                    "status": connected,
+                    "message": "Connected" if connected else "Disconnected",
+                },
+            )
+        if route == "start-session":
+            if data.get("webhook"):
+                state["webhook"] = data["webhook"]
+            if state["status"] != "CONNECTED":
+                self.set_status(session, "QRCODE")
+            return json_response(
+                200,
+                {"status": state["status"], "session": session, "qrcode": None},
+            )
+        if route in ("close-session", "logout-session"):
+            self.set_status(session, "CLOSED")
+            return json_response(200, {"status": True, "message": "Session closed"})
+        if route == "qrcode-session":
+            return 200, {"Content-Type": "image/png"}, QR_PNG
+        if route == "host-device":
+            return json_response(
+                200,
+                {
+                    "status": "success",
+                    "response": {
+                        "phoneNumber": f"{self.phone}@c.us",
+                        "pushname": "Mock Gateway",
+                        "platform": "android",
+                    },
+                    "mapper": "device",
+                },
+            )
+        if route == "group-members":
+            group_id = path.rstrip("/").rsplit("/", 1)[-1]
+            members = [
+                {
+                    "id": {"user": member, "_serialized": f"{member}@c.us"},
+                    "formattedName": "You" if member == self.phone else member,
+                }
+                for member in self._group_members(group_id)
+            ]
+            return json_response(200, {"status": "success", "response": members})
+        if send:
+            message_id = self._record_send(session, data)
+            return json_response(
+                201,
+                {
+                    "status": "success",
+                    "response": [{"id": message_id, "ack": 1, "fromMe": True}],
+                },
+            )
+        # every other endpoint succeeds without side effects
+        return json_response(200, {"status": "success", "response": {}})
+
+    def route_wwebjs(
+        self,
+        route: str,
+        session: str,
+        send: bool,
+        path: str,
+        headers: Dict[str, str],
+        data: dict,
+    ) -> Response:
+        """Answers a WWebJS API request."""
+        if self.secret_key and headers.get("x-api-key") != self.secret_key:
+            return json_response(403, {"success": False, "error": "Invalid API key"})
+        if route == "ping":
+            return json_response(200, {"success": True, "message": "pong"})
+        if route == "session/getSessions":
+            return json_response(200, {"success": True, "result": list(self.sessions)})
+
+        state = self.session(session)
+        connected = state["status"] == "CONNECTED"
+        if route == "session/status":
+            return json_response(
+                200,
+                {
+                    "success": connected,
+                    "state": state["status"] if state["status"] != "CLOSED" else None,
+                    "message": (
+                        "session_connected" if connected else "session_not_connected"
+                    ),
+                },
+            )
+        if route == "client/getState":
+            return json_response(
+                200, {"success": True, "state": state["status"] or None}
+            )
+        if route == "session/start":
+            if data.get("webhookUrl"):
+                state["webhook"] = data["webhookUrl"]
+            if not connected:
+                self.set_status(session, "QRCODE")
+            return json_response(
+                200, {"success": True, "message": "Session initiated successfully"}
+            )
+        if route in ("session/stop", "session/terminate"):
+            self.set_status(session, "CLOSED")
+            return json_response(200, {"success": True, "message": "Session stopped"})
+        if route == "session/qr":
+            return 200, {"Content-Type": "image/png"}, QR_PNG
+        if route == "client/getClassInfo":
+            return json_response(
+                200,
+                {
+                    "success": True,
+                    "sessionInfo": {
+                        "wid": {
+                            "_serialized": f"{self.phone}@c.us",
+                            "user": self.phone,
+                        },
+                        "pushname": "Mock Gateway",
+                        "platform": "android",
+                    },
+                },
+            )
+        if route == "groupChat/getClassInfo":
+            group_id = str(data.get("chatId", ""))
+            participants = [
+                {"id": {"user": f"{member}@c.us", "_serialized": f"{member}@c.us"}}
+                for member in self._group_members(group_id)
+            ]
+            return json_response(
+                200,
+                {
+                    "success": True,
+                    "chat": {"groupMetadata": {"participants": participants}},
+                },
+            )
+        if route == "client/getContactLidAndPhone":
+            results = []
+            for user_id in data.get("userIds", []):
+                lid = str(user_id).split("@")[0]
+                # LIDs resolve to a stable phone number derived from the LID
+                phone = f"1555{int(re.sub(r'[^0-9]', '', lid) or 0) % 10**7:07d}"
+                results.append({"lid": user_id, "pn": f"{phone}@c.us"})
+            return json_response(200, {"success": True, "data": results})
+        if send:
+            message_id = self._record_send(session, data)
+            return json_response(
+                200,
+                {
+                    "success": True,
+                    "message": {
+                        "id": {"fromMe": True, "_serialized": message_id},
+                        "ack": 1,
+                    },
+                },
+            )
+        # every other endpoint succeeds without side effects
+        return json_response(200, {"success": True})
+
+
+class MockGatewayHandler(BaseHTTPRequestHandler):
+    """Passes requests to the MockGateway of the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        gateway: MockGateway = self.server.gateway  # type: ignore[attr-defined]
+        status_code, headers, payload = gateway.handle(
+            self.command, self.path, dict(self.headers.items()), body
+        )
+        try:
+            self.send_response(status_code)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # the client gave up, e.g. after an injected timeout
+            pass
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Handles GET requests."""
+        self._respond()
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Handles POST requests."""
+        self._respond()
+
+    def do_PUT(self) -> None:  # noqa: N802
+        """Handles PUT requests."""
+        self._respond()
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        """Handles DELETE requests."""
+        self._respond()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Silences per-request logging, which would dominate a load test."""
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Serves a mock gateway until interrupted, optionally emitting inbound message webhooks."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--flavor", choices=[WPPCONNECT, WWEBJS], default=WPPCONNECT)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=21465)
+    parser.add_argument("--secret-key", default="THISISMYSECURETOKEN")
+    parser.add_argument("--status", default="CONNECTED")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--send-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--webhook", default="", help="webhook URL for emitted messages"
+    )
+    parser.add_argument("--session", default="mock", help="session of emitted messages")
+    parser.add_argument("--emit", choices=MESSAGE_KINDS, action="append", default=[])
+    parser.add_argument("--count", type=int, default=100, help="messages to emit")
+    parser.add_argument("--rate", type=float, default=10.0, help="messages per second")
+    args = parser.parse_args(argv)
+
+    gateway = MockGateway(
+        flavor=args.flavor,
+        host=args.host,
+        port=args.port,
+        secret_key=args.secret_key,
+        status=args.status,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        throttle_rate=args.throttle_rate,
+        send_rate=args.send_rate,
+        webhook_url=args.webhook,
+        seed=args.seed,
+    ).start()
+    print(f"mock {args.flavor} gateway serving at {gateway.api_url}")
+    try:
+        for index in range(args.count if args.emit else 0):
+            kind = args.emit[index % len(args.emit)]
+            gateway.emit_async(
+                message_event(
+                    args.flavor, args.session, kind, sender=f"1555{index % 10**7:07d}"
+                )
+            )
+            time.sleep(1 / args.rate if args.rate > 0 else 0)
+        while True:
+            time.sleep(5)
+            print(json.dumps(gateway.snapshot()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gateway.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ from streamlit_router import StreamlitRouter
 # Constants
 API_TIMEOUT = 30
 AUTO_REFRESH_INTERVAL = 5
+SESSION_POLL_TIMEOUT = 20
 PAGE_SIZES = [5, 10, 20, 50, 100, 200]
 DEFAULT_PAGE_SIZE = 10
 
@@ -186,7 +187,7 @@ def validated_input(
 
 
 def _render_session_registration(state: StateManager, agent_id: str) -> None:
-    """Render the Session Registration section with reliable auto-refresh."""
+    """Render the Session Registration section, re-rendering when the session state changes."""
     # if not isinstance(state, dict):
     #     state = {}
 
@@ -201,6 +202,38 @@ def _render_session_registration(state: StateManager, agent_id: str) -> None:
             state.set("session_payload", response)
             state.set("last_refresh", time.time())
 
+    def wait_for_session_change() -> bool:
+        """Long-poll the session state and return True once the stored status has changed."""
+        response = handle_api_call(
+            endpoint="action/walker/wppconnect_action/get_session_state",
+            json_data={
+                "agent_id": agent_id,
+                "since_version": state.get("session_version", 0),
+                "timeout": SESSION_POLL_TIMEOUT,
+            },
+            success_message=None,
+        )
+        if not isinstance(response, dict):
+            time.sleep(AUTO_REFRESH_INTERVAL)
+            return True
+
+        state.set("session_version", response.get("version", 0))
+        if not response.get("changed"):
+            return False
+
+        previous = state.get("session_payload", {})
+        if response.get("status") == "CONNECTED":
+            # registration returns the full session and device details once connected
+            get_wppconnect_status(auto_register=False)
+        else:
+            payload = dict(previous) if isinstance(previous, dict) else {}
+            for key in ["status", "qrcode"]:
+                if key in response:
+                    payload[key] = response[key]
+            state.set("session_payload", payload)
+            state.set("last_refresh", time.time())
+        return state.get("session_payload", {}) != previous
+
     def logout_wppconnect() -> None:
         """Logout session state."""
         if handle_api_call(
@@ -360,8 +393,9 @@ def _render_session_registration(state: StateManager, agent_id: str) -> None:
             "CONNECTED",
             "CLOSED",
         ]:
-            time.sleep(AUTO_REFRESH_INTERVAL)
-            get_wppconnect_status(auto_register=False)
+            # re-render only when the session state actually changes
+            while not wait_for_session_change():
+                pass
             st.rerun()
 
 
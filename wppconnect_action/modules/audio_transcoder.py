@@ -0,0 +1,106 @@
+"""Transcoding of outbound voice notes to WhatsApp-native OGG/Opus, with a result cache."""
+
+import base64
+import hashlib
+import logging
+import shutil
+import subprocess
+from typing import Optional
+
+import requests
+
+from .cache import get_cache
+from .worker_pool import submit
+
+logger = logging.getLogger(__name__)
+
+VOICE_MIME_TYPE = "audio/ogg; codecs=opus"
+
+
+def ffmpeg_available() -> bool:
+    """Returns True if an ffmpeg binary is on the PATH."""
+    return shutil.which("ffmpeg") is not None
+
+
+def transcode_to_opus(
+    audio: bytes, bitrate: str = "32k", timeout: float = 30.0
+) -> bytes:
+    """
+    Converts audio in any format ffmpeg understands to mono 48 kHz OGG/Opus.
+
+    :raises RuntimeError: if ffmpeg fails.
+    """
+    process = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            "pipe:0",
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            "48000",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            bitrate,
+            "-application",
+            "voip",
+            "-f",
+            "ogg",
+            "pipe:1",
+        ],
+        input=audio,
+        capture_output=True,
+        timeout=timeout,
+    )
+    if process.returncode != 0 or not process.stdout:
+        raise RuntimeError(process.stderr.decode("utf-8", "ignore").strip())
+    return process.stdout
+
+
+def get_voice_note(
+    audio_url: str,
+    max_workers: int = 2,
+    timeout: float = 30.0,
+    cache_ttl: float = 86400,
+) -> Optional[str]:
+    """
+    Returns the audio at audio_url as base64 OGG/Opus, transcoding it at most once.
+
+    Results are cached by content hash, and the URL is mapped to that hash, so repeated
+    phrases (e.g. greetings) skip both the download and ffmpeg. Transcoding runs on a
+    bounded pool so concurrent replies cannot spawn unbounded ffmpeg processes.
+
+    :return: base64 encoded OGG/Opus audio, or None if it could not be produced.
+    """
+    if not ffmpeg_available():
+        logger.warning("ffmpeg not found, voice notes are sent without transcoding")
+        return None
+
+    cache = get_cache("voice_notes", ttl=cache_ttl, max_entries=512)
+    url_key = f"url:{audio_url}"
+    if (audio_hash := cache.get(url_key)) and (voice_note := cache.get(audio_hash)):
+        return voice_note
+
+    try:
+        response = requests.get(audio_url, timeout=timeout)
+        response.raise_for_status()
+        audio_hash = hashlib.sha256(response.content).hexdigest()
+
+        voice_note = cache.get(audio_hash)
+        if not voice_note:
+            opus = submit(
+                "transcode", max_workers, transcode_to_opus, response.content
+            ).result(timeout=timeout)
+            voice_note = base64.b64encode(opus).decode("utf-8")
+            cache.set(audio_hash, voice_note)
+
+        cache.set(url_key, audio_hash)
+        return voice_note
+    except Exception as e:
+        logger.error(f"Failed to transcode voice note {audio_url}: {e}")
+        return None
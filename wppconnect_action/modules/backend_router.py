@@ -0,0 +1,250 @@
+"""Failover routing of gateway calls between a primary and a standby WhatsApp gateway."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .circuit_breaker import CIRCUIT_OPEN_ERROR, OPEN
+from .deadline_scheduler import get_scheduler
+from .worker_pool import submit
+
+logger = logging.getLogger(__name__)
+
+# webhook parsers are tried on every backend, since webhooks may come from either gateway
+PARSER_METHODS = frozenset(
+    {"parse_session_event", "parse_inbound_message", "get_webhook_session"}
+)
+
+
+class BackendStats:
+    """Health and routing counters of one router key, kept across the short-lived routers."""
+
+    def __init__(self) -> None:
+        """Initializes empty counters."""
+        self.backends: List[Tuple[str, Any]] = []
+        self.health: Dict[str, dict] = {}
+        self.selected: Dict[str, int] = {}
+        self.failovers = 0
+        self.switches = 0
+        self.active = ""
+        self.touched = time.monotonic()
+        self._lock = threading.Lock()
+
+    def is_healthy(self, name: str) -> bool:
+        """Returns False only if the last health check of the backend failed."""
+        with self._lock:
+            return self.health.get(name, {}).get("healthy", True)
+
+    def record_health(self, name: str, healthy: bool, message: str = "") -> None:
+        """Records the result of a health check."""
+        with self._lock:
+            self.health[name] = {
+                "healthy": healthy,
+                "message": message,
+                "checked_at": time.time(),
+            }
+
+    def record_selection(self, name: str, primary: bool) -> None:
+        """Counts a call routed to the backend, and any switch of the active backend."""
+        with self._lock:
+            self.selected[name] = self.selected.get(name, 0) + 1
+            if not primary:
+                self.failovers += 1
+            if self.active and name != self.active:
+                self.switches += 1
+                logger.warning(f"gateway calls switched from {self.active} to {name}")
+            self.active = name
+
+    def snapshot(self) -> dict:
+        """Returns the current counters."""
+        with self._lock:
+            return {
+                "active": self.active,
+                "selected": dict(self.selected),
+                "failovers": self.failovers,
+                "switches": self.switches,
+                "health": {name: dict(health) for name, health in self.health.items()},
+            }
+
+
+_stats: Dict[str, BackendStats] = {}
+_registry_lock = threading.Lock()
+
+
+def get_backend_stats(key: str) -> BackendStats:
+    """Returns the process-wide routing counters for key, creating them on first use."""
+    with _registry_lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = BackendStats()
+            _stats[key] = stats
+        return stats
+
+
+def is_circuit_rejection(result: Any) -> bool:  # noqa: ANN401
+    """Returns True if result is a call failed fast by an open circuit, i.e. one never sent."""
+    return isinstance(result, dict) and result.get("error") == CIRCUIT_OPEN_ERROR
+
+
+def describe_backend(
+    name: str,
+    client: Any,  # noqa: ANN401
+    stats: Optional[BackendStats] = None,
+) -> dict:
+    """Returns the endpoint, circuit, rate limiter and health of a backend client."""
+    breaker = getattr(client, "breaker", None)
+    limiter = getattr(client, "limiter", None)
+    return {
+        "name": name,
+        "api_url": client.api_url,
+        "session": client.session,
+        "client": type(client).__name__,
+        "circuit": breaker.snapshot() if breaker else {},
+        "limiter": limiter.snapshot() if limiter else {},
+        "health": (stats.health.get(name, {}) if stats else {}),
+    }
+
+
+def run_health_checks(key: str, interval: float) -> None:
+    """
+    Probes every backend of key and re-arms itself after interval seconds.
+
+    Checks stop once no router has been created for key in a while, i.e. failover was turned off.
+    """
+    stats = get_backend_stats(key)
+    for name, client in list(stats.backends):
+        try:
+            result = client.check_connection()
+            healthy = bool(result.get("status")) and "error" not in result
+            stats.record_health(name, healthy, str(result.get("message") or ""))
+        except Exception as e:
+            stats.record_health(name, False, str(e))
+    if time.monotonic() - stats.touched < max(10 * interval, 300.0):
+        schedule_health_checks(key, interval)
+
+
+def schedule_health_checks(key: str, interval: float) -> None:
+    """Arms the next health check of key's backends, unless one is pending."""
+    timer_key = f"gateway_health:{key}"
+    if get_scheduler().pending(timer_key) is None:
+        # the probes run on their own pool so they never hold up the scheduler thread
+        get_scheduler().schedule(
+            timer_key,
+            interval,
+            submit,
+            "gateway_health",
+            1,
+            run_health_checks,
+            key,
+            interval,
+        )
+
+
+class BackendRouter:
+    """
+    Sends gateway calls to the first available backend of an ordered list.
+
+    A backend is skipped while its circuit is open or its last health check failed; when no
+    backend is available the primary is used. Choosing a backend only reads in-memory state, so
+    routing adds no requests to a call. A call failed fast by an open circuit never reached its
+    gateway, so it is safe to repeat on the next backend. Health checks run in the background
+    every health_interval seconds.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        backends: List[Tuple[str, Any]],
+        health_interval: float = 15.0,
+    ) -> None:
+        """
+        Initializes the router.
+
+        :param key: Identifies the routed session; counters and health are shared per key.
+        :param backends: (name, client) pairs, the primary first.
+        :param health_interval: Seconds between background health checks; 0 disables them.
+        """
+        self.key = key
+        self.backends = backends
+        self.stats = get_backend_stats(key)
+        self.stats.backends = backends
+        self.stats.touched = time.monotonic()
+        if health_interval > 0:
+            schedule_health_checks(key, health_interval)
+
+    @property
+    def primary(self) -> str:
+        """Returns the name of the primary backend."""
+        return self.backends[0][0]
+
+    def is_available(self, name: str, client: Any) -> bool:  # noqa: ANN401
+        """Returns True unless the backend's circuit is open or its last health check failed."""
+        breaker = getattr(client, "breaker", None)
+        if breaker is not None and breaker.state == OPEN and breaker.retry_in() > 0:
+            return False
+        return self.stats.is_healthy(name)
+
+    def candidates(self) -> List[Tuple[str, Any]]:
+        """Returns the available backends in order of preference, or the primary if none are."""
+        available = [
+            (name, client)
+            for name, client in self.backends
+            if self.is_available(name, client)
+        ]
+        return available or self.backends[:1]
+
+    def registration_step(self, state: dict, **kwargs: Any) -> dict:  # noqa: ANN401
+        """
+        Runs a registration step on the primary backend.
+
+        Registration is never failed over: the standby session is registered separately, with its
+        own token and webhook, so it is ready before calls fail over to it.
+        """
+        return self.backends[0][1].registration_step(state, **kwargs)
+
+    def snapshot(self) -> dict:
+        """Returns the backends with their circuit, limiter and health, and the routing counters."""
+        return {
+            "backends": [
+                describe_backend(name, client, self.stats)
+                for name, client in self.backends
+            ],
+            "routing": self.stats.snapshot(),
+        }
+
+    def __getattr__(self, attr: str) -> Any:  # noqa: ANN401
+        """Forwards attribute access to the active backend, failing calls over when needed."""
+        if attr.startswith("__") or attr in ("key", "backends", "stats"):
+            raise AttributeError(attr)
+        if attr in PARSER_METHODS:
+            return self._parse(attr)
+        value = getattr(self.candidates()[0][1], attr)
+        if not callable(value):
+            return value
+        return self._call(attr)
+
+    def _parse(self, attr: str) -> Callable[..., Any]:
+        def parse(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            result: Any = None
+            for _name, client in self.backends:
+                result = getattr(client, attr)(*args, **kwargs)
+                if result:
+                    return result
+            return result
+
+        return parse
+
+    def _call(self, attr: str) -> Callable[..., Any]:
+        def call(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            candidates = self.candidates()
+            result: Any = None
+            for name, client in candidates:
+                self.stats.record_selection(name, primary=name == self.primary)
+                result = getattr(client, attr)(*args, **kwargs)
+                if not is_circuit_rejection(result):
+                    return result
+                logger.warning(f"{attr} rejected by the {name} gateway circuit")
+            return result
+
+        return call
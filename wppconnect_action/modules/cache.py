@@ -0,0 +1,361 @@
+"""
+Key/value caches with per-entry expiry.
+
+Caches are in-process by default. configure_cache points them at a Redis server, so that
+cache hits and claims are shared by every worker process and node.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union
+
+try:
+    import redis
+    from redis.exceptions import WatchError
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None  # type: ignore[assignment]
+    WatchError = RuntimeError  # type: ignore[assignment,misc]
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCache:
+    """
+    Thread-safe in-memory cache with a default TTL and a bound on the number of entries.
+
+    Entries are evicted lazily when read after expiry, and the least recently written entry
+    is dropped once max_entries is exceeded.
+    """
+
+    shared = False
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10000) -> None:
+        """
+        Initializes the cache.
+
+        :param ttl: Default seconds an entry stays valid; 0 keeps entries until evicted.
+        :param max_entries: Maximum number of entries held.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:  # noqa: ANN401
+        """Returns the cached value for key, or default if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,  # noqa: ANN401
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Caches value under key.
+
+        :param ttl: Seconds the entry stays valid; defaults to the cache ttl.
+        """
+        with self._lock:
+            self._put(key, value, ttl)
+
+    def add(
+        self,
+        key: str,
+        value: Any,  # noqa: ANN401
+        ttl: Optional[float] = None,
+    ) -> bool:
+        """Caches value under key only if no live entry exists; returns True if it was added."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (not entry[1] or entry[1] > time.monotonic()):
+                return False
+            self._put(key, value, ttl)
+            return True
+
+    def incr(self, key: str, ttl: Optional[float] = None, amount: int = 1) -> int:
+        """Adds amount to the integer under key, starting from 0; returns the new value."""
+        with self._lock:
+            entry = self._data.get(key)
+            current = 0
+            if entry is not None and (not entry[1] or entry[1] > time.monotonic()):
+                current = int(entry[0])
+            self._put(key, current + amount, ttl)
+            return current + amount
+
+    def update(
+        self,
+        key: str,
+        fn: Callable[[Any], Any],
+        ttl: Optional[float] = None,
+    ) -> Any:  # noqa: ANN401
+        """
+        Replaces the value of key with fn(value), atomically.
+
+        :param fn: called with the current value, or None if there is none; returning None leaves key unchanged.
+        :return: the new value, or None if fn returned None.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            current = None
+            if entry is not None and (not entry[1] or entry[1] > time.monotonic()):
+                current = entry[0]
+            value = fn(current)
+            if value is not None:
+                self._put(key, value, ttl)
+            return value
+
+    def _put(self, key: str, value: Any, ttl: Optional[float]) -> None:  # noqa: ANN401
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else 0.0
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        """Removes key; returns True if it was cached."""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Returns the number of entries held, including any not yet evicted after expiry."""
+        return len(self._data)
+
+
+class RedisCache:
+    """
+    Cache with the LocalCache interface, stored in Redis so it is shared across processes.
+
+    Values are stored as JSON under a per-cache key prefix and expire through Redis TTLs, so
+    max_entries is not enforced. Redis errors are logged and treated as cache misses, so an
+    unreachable server degrades to uncached behaviour rather than failing requests.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        client: Any,  # noqa: ANN401
+        prefix: str,
+        ttl: float = 300.0,
+    ) -> None:
+        """
+        Initializes the cache.
+
+        :param client: A redis.Redis client.
+        :param prefix: Namespace of this cache's keys.
+        :param ttl: Default seconds an entry stays valid; 0 keeps entries until deleted.
+        """
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _px(self, ttl: Optional[float]) -> Optional[int]:
+        ttl = self.ttl if ttl is None else ttl
+        return max(1, int(ttl * 1000)) if ttl else None
+
+    def get(self, key: str, default: Any = None) -> Any:  # noqa: ANN401
+        """Returns the cached value for key, or default if it is missing or expired."""
+        try:
+            raw = self.client.get(self._key(key))
+        except Exception as e:
+            logger.warning(f"shared cache read failed for {key}: {e}")
+            return default
+        return default if raw is None else json.loads(raw)
+
+    def set(
+        self,
+        key: str,
+        value: Any,  # noqa: ANN401
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Caches value under key.
+
+        :param ttl: Seconds the entry stays valid; defaults to the cache ttl.
+        """
+        try:
+            self.client.set(self._key(key), json.dumps(value), px=self._px(ttl))
+        except Exception as e:
+            logger.warning(f"shared cache write failed for {key}: {e}")
+
+    def add(
+        self,
+        key: str,
+        value: Any,  # noqa: ANN401
+        ttl: Optional[float] = None,
+    ) -> bool:
+        """Caches value under key only if no live entry exists; returns True if it was added."""
+        try:
+            return bool(
+                self.client.set(
+                    self._key(key), json.dumps(value), px=self._px(ttl), nx=True
+                )
+            )
+        except Exception as e:
+            # without the shared cache the claim cannot be arbitrated, so let the caller proceed
+            logger.warning(f"shared cache add failed for {key}: {e}")
+            return True
+
+    def incr(
+        self, key: str, ttl: Optional[float] = None, amount: int = 1
+    ) -> Optional[int]:
+        """
+        Atomically adds amount to the integer under key, starting from 0; returns the new value.
+
+        :param ttl: Seconds until the counter expires, renewed on every increment; defaults to the cache ttl.
+        :param amount: the increment; negative to decrement.
+        :return: the new value, or None if the server could not be reached.
+        """
+        try:
+            value = int(self.client.incr(self._key(key), amount))
+            if px := self._px(ttl):
+                self.client.pexpire(self._key(key), px)
+            return value
+        except Exception as e:
+            logger.warning(f"shared cache increment failed for {key}: {e}")
+            return None
+
+    def update(
+        self,
+        key: str,
+        fn: Callable[[Any], Any],
+        ttl: Optional[float] = None,
+        retries: int = 20,
+    ) -> Any:  # noqa: ANN401
+        """
+        Replaces the value of key with fn(value), atomically across processes.
+
+        The key is watched while fn runs and the write is discarded and retried if another
+        process changed it meanwhile, so concurrent updates are never lost.
+
+        :param fn: called with the current value, or None if there is none; returning None leaves key unchanged.
+            It may be called several times, so it must not have side effects.
+        :return: the new value, or None if fn returned None, the server could not be reached or
+            the key kept changing for retries attempts.
+        """
+        name = self._key(key)
+        try:
+            with self.client.pipeline() as pipe:
+                for _ in range(max(1, retries)):
+                    try:
+                        pipe.watch(name)
+                        raw = pipe.get(name)
+                        value = fn(None if raw is None else json.loads(raw))
+                        if value is None:
+                            pipe.unwatch()
+                            return None
+                        pipe.multi()
+                        pipe.set(name, json.dumps(value), px=self._px(ttl))
+                        pipe.execute()
+                        return value
+                    except WatchError:
+                        continue
+            logger.warning(f"shared cache update of {key} kept conflicting, giving up")
+        except Exception as e:
+            logger.warning(f"shared cache update failed for {key}: {e}")
+        return None
+
+    def delete(self, key: str) -> bool:
+        """Removes key; returns True if it was cached."""
+        try:
+            return bool(self.client.delete(self._key(key)))
+        except Exception as e:
+            logger.warning(f"shared cache delete failed for {key}: {e}")
+            return False
+
+    def clear(self) -> None:
+        """Removes all entries of this cache."""
+        try:
+            keys = list(self.client.scan_iter(match=f"{self.prefix}:*"))
+            if keys:
+                self.client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"shared cache clear failed for {self.prefix}: {e}")
+
+    def __len__(self) -> int:
+        """Returns the number of live entries of this cache."""
+        try:
+            return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}:*"))
+        except Exception:
+            return 0
+
+
+Cache = Union[LocalCache, RedisCache]
+
+_caches: Dict[str, Cache] = {}
+_registry_lock = threading.Lock()
+_backend_url = ""
+_client: Any = None
+_ignored_urls: Set[str] = set()
+
+
+def configure_cache(url: str = "") -> None:
+    """
+    Selects the backend of every cache returned by get_cache, once per process.
+
+    The backend is process-wide, so the first Redis URL configured wins: caches, and the claims
+    held in them, are never dropped by a later call. Later calls with another URL are ignored
+    with a warning, and calls without one leave the backend as it is.
+
+    :param url: "" for in-process caches, or a redis:// or rediss:// URL of a Redis server
+        shared by all workers.
+    """
+    global _backend_url, _client
+    url = url or ""
+    if url == _backend_url or not url:
+        return
+    with _registry_lock:
+        if url == _backend_url:
+            return
+        if _backend_url:
+            if url not in _ignored_urls:
+                _ignored_urls.add(url)
+                logger.warning(
+                    f"shared cache already configured as {_backend_url}, ignoring {url}"
+                )
+            return
+        if redis is None:
+            if url not in _ignored_urls:
+                _ignored_urls.add(url)
+                logger.error("redis is not installed, using in-process caches")
+            return
+        _client = redis.Redis.from_url(
+            url, socket_timeout=1.0, socket_connect_timeout=1.0
+        )
+        _backend_url = url
+        # in-process caches created before the backend was configured are replaced by shared ones
+        _caches.clear()
+
+
+def get_cache(name: str, ttl: float = 300.0, max_entries: int = 10000) -> Cache:
+    """Returns the process-wide cache registered under name, creating it on first use."""
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            if _client is not None:
+                cache = RedisCache(_client, prefix=f"wppconnect:{name}", ttl=ttl)
+            else:
+                cache = LocalCache(ttl=ttl, max_entries=max_entries)
+            _caches[name] = cache
+        return cache
@@ -0,0 +1,140 @@
+"""Circuit breaker guarding calls to a WhatsApp gateway server."""
+
+import threading
+import time
+from typing import Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CIRCUIT_OPEN_ERROR = "Gateway unavailable (circuit open)"
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while a gateway is unreachable.
+
+    The circuit opens after failure_threshold consecutive failures. While open, calls are
+    rejected without touching the network until reset_timeout elapses; the circuit then
+    half-opens and lets a single trial call through, closing on success and re-opening on
+    failure. Probe calls (e.g. connection checks) are always let through so a healthcheck
+    can close the circuit as soon as the gateway recovers.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Initializes the breaker.
+
+        :param failure_threshold: Consecutive failures which open the circuit.
+        :param reset_timeout: Seconds the circuit stays open before allowing a trial call.
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_owner = 0
+        self._lock = threading.Lock()
+
+    def configure(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Updates the breaker thresholds."""
+        with self._lock:
+            self.failure_threshold = max(1, failure_threshold)
+            self.reset_timeout = reset_timeout
+
+    def allow_request(self, probe: bool = False) -> bool:
+        """
+        Returns True if a call may proceed.
+
+        :param probe: the call is a lightweight connection check and is always allowed.
+        """
+        with self._lock:
+            if self.state == CLOSED or probe:
+                return True
+            if (
+                self.state == OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                self._trial_owner = threading.get_ident()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Closes the circuit and clears the failure count."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Counts a failure, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """
+        Gives up the trial call held by the calling thread, if any, without recording an outcome.
+
+        Calls end with record_success or record_failure, which settle the trial; this is their
+        fallback for a call which ended otherwise, e.g. by an unexpected exception, so the next
+        call may become the trial instead of the circuit staying half-open for good.
+        """
+        with self._lock:
+            if self._trial_in_flight and self._trial_owner == threading.get_ident():
+                self._trial_in_flight = False
+
+    def retry_in(self) -> float:
+        """Returns the seconds until an open circuit allows a trial call."""
+        if self.state != OPEN:
+            return 0.0
+        return max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+
+    def snapshot(self) -> dict:
+        """Returns the current breaker state."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in": round(self.retry_in(), 3),
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(
+    key: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+) -> CircuitBreaker:
+    """
+    Returns the process-wide breaker for key (typically the gateway api_url), creating it on first use.
+
+    API clients are created per call, so the breaker must outlive them to keep its state.
+    """
+    with _registry_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=failure_threshold, reset_timeout=reset_timeout
+            )
+            _breakers[key] = breaker
+        elif (breaker.failure_threshold, breaker.reset_timeout) != (
+            max(1, failure_threshold),
+            reset_timeout,
+        ):
+            breaker.configure(
+                failure_threshold=failure_threshold, reset_timeout=reset_timeout
+            )
+        return breaker
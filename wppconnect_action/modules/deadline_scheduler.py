@@ -0,0 +1,115 @@
+"""Deadline timers which fire a callback once a keyed deadline passes."""
+
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineScheduler:
+    """
+    Fires callbacks at per-key deadlines from a single background thread.
+
+    Deadlines are kept in a min-heap, so the thread sleeps until the earliest one is due
+    instead of polling. Scheduling a key again replaces its deadline; superseded heap
+    entries are skipped lazily when they surface. Each callback runs in a fresh
+    contextvars context so it can set up its own request context.
+    """
+
+    def __init__(self, name: str = "deadlines") -> None:
+        """
+        Initializes the scheduler; the timer thread starts on first use.
+
+        :param name: Name given to the timer thread.
+        """
+        self.name = name
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, Tuple[float, int, Callable[..., Any], tuple]] = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(
+        self,
+        key: str,
+        delay: float,
+        callback: Callable[..., Any],
+        *args: Any,  # noqa: ANN401
+    ) -> None:
+        """
+        Arms or resets the deadline for key.
+
+        :param delay: Seconds from now at which callback(*args) fires.
+        """
+        deadline = time.monotonic() + max(delay, 0.0)
+        with self._cond:
+            seq = next(self._counter)
+            self._entries[key] = (deadline, seq, callback, args)
+            heapq.heappush(self._heap, (deadline, seq, key))
+            self._ensure_thread()
+            self._cond.notify()
+
+    def cancel(self, key: str) -> bool:
+        """Disarms the deadline for key; returns True if one was pending."""
+        with self._cond:
+            return self._entries.pop(key, None) is not None
+
+    def pending(self, key: str) -> Optional[float]:
+        """Returns the seconds left before key fires, or None if it is not scheduled."""
+        with self._cond:
+            entry = self._entries.get(key)
+            return max(entry[0] - time.monotonic(), 0.0) if entry else None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name=f"wpp-{self.name}", daemon=True
+            )
+            self._thread.start()
+
+    def _next_due(self) -> Tuple[Callable[..., Any], tuple]:
+        """Blocks until the earliest live deadline passes and returns its callback."""
+        with self._cond:
+            while True:
+                while self._heap:
+                    deadline, seq, key = self._heap[0]
+                    entry = self._entries.get(key)
+                    if entry is None or entry[1] != seq:
+                        # cancelled or rescheduled since this entry was pushed
+                        heapq.heappop(self._heap)
+                        continue
+                    wait = deadline - time.monotonic()
+                    if wait <= 0:
+                        heapq.heappop(self._heap)
+                        del self._entries[key]
+                        return entry[2], entry[3]
+                    break
+                else:
+                    wait = None
+                self._cond.wait(timeout=wait)
+
+    def _run(self) -> None:
+        while True:
+            callback, args = self._next_due()
+            try:
+                contextvars.Context().run(callback, *args)
+            except Exception as e:
+                logger.error(f"deadline callback failed: {e}")
+
+
+_scheduler: Optional[DeadlineScheduler] = None
+_lock = threading.Lock()
+
+
+def get_scheduler() -> DeadlineScheduler:
+    """Returns the process-wide deadline scheduler."""
+    global _scheduler
+    with _lock:
+        if _scheduler is None:
+            _scheduler = DeadlineScheduler()
+        return _scheduler
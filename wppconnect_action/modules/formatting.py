@@ -0,0 +1,14 @@
+"""Conversion of agent response markup to WhatsApp text formatting."""
+
+# markup replaced in outbound text, in order: markdown bold, HTML line breaks and bold tags
+MARKUP_REPLACEMENTS = (("**", "*"), ("<br/>", "\n"), ("<b>", "*"), ("</b>", "*"))
+
+
+def sanitize_message(message: str) -> str:
+    """Rewrites markdown bold and HTML bold/line-break markup in message as WhatsApp formatting."""
+    # most replies carry no markup, so skip the copies made by each replace
+    if "*" not in message and "<" not in message:
+        return message
+    for markup, replacement in MARKUP_REPLACEMENTS:
+        message = message.replace(markup, replacement)
+    return message
@@ -0,0 +1,89 @@
+"""Consistent hash ring for sharding recipients across a changing set of gateway sessions."""
+
+import bisect
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+class HashRing:
+    """
+    Maps keys to nodes so that each key keeps the same node while the node set is unchanged.
+
+    Every node is placed on the ring at replicas points; a key belongs to the first node
+    point at or after its own hash. Adding or removing a node only moves the keys on that
+    node's arcs, roughly 1/n of them, rather than reshuffling every key as hash-mod-n would.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 160) -> None:
+        """
+        Initializes the ring.
+
+        :param nodes: Initial nodes.
+        :param replicas: Points per node on the ring; more points spread keys more evenly.
+        """
+        self.replicas = max(1, replicas)
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self._nodes: set = set()
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        """Returns the nodes on the ring, sorted."""
+        return sorted(self._nodes)
+
+    def add(self, node: str) -> None:
+        """Places node on the ring."""
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            if point not in self._owners:
+                bisect.insort(self._points, point)
+                self._owners[point] = node
+
+    def remove(self, node: str) -> None:
+        """Takes node off the ring."""
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        self._points = [point for point in self._points if self._owners[point] != node]
+        self._owners = {point: self._owners[point] for point in self._points}
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the node which key belongs to, or None if the ring is empty."""
+        if not self._points:
+            return None
+        index = bisect.bisect_left(self._points, _hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+_rings: Dict[Tuple[Tuple[str, ...], int], HashRing] = {}
+_lock = threading.Lock()
+_MAX_RINGS = 64
+
+
+def get_hash_ring(nodes: Iterable[str], replicas: int = 160) -> HashRing:
+    """
+    Returns a process-wide ring over nodes, built once per distinct node set.
+
+    Rings are treated as read-only once returned.
+    """
+    key = (tuple(sorted(set(nodes))), replicas)
+    with _lock:
+        ring = _rings.get(key)
+        if ring is None:
+            if len(_rings) >= _MAX_RINGS:
+                _rings.clear()
+            ring = HashRing(key[0], replicas=replicas)
+            _rings[key] = ring
+        return ring
@@ -0,0 +1,119 @@
+"""Inbound media preprocessing: thumbnails, image dimensions, PDF page counts and text."""
+
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = None
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def preprocess_media(
+    file_data: bytes,
+    mime_type: str,
+    thumbnail_size: int = 320,
+    max_text_chars: int = 4000,
+) -> dict:
+    """
+    Extracts metadata from an image or PDF.
+
+    Images yield their format and dimensions plus a JPEG thumbnail no larger than
+    thumbnail_size on either side; PDFs yield their page count and leading text. Each
+    step is skipped when its optional dependency (Pillow, pypdf) is not installed.
+
+    :return: dict of metadata; thumbnail bytes are returned under "thumbnail".
+    """
+    metadata: dict = {}
+    mime_type = (mime_type or "").lower()
+
+    if mime_type.startswith("image/") and Image is not None:
+        with Image.open(io.BytesIO(file_data)) as image:
+            metadata["format"] = image.format
+            metadata["width"], metadata["height"] = image.size
+            if thumbnail_size > 0:
+                image.thumbnail((thumbnail_size, thumbnail_size))
+                buffer = io.BytesIO()
+                image.convert("RGB").save(buffer, format="JPEG", quality=80)
+                metadata["thumbnail"] = buffer.getvalue()
+
+    elif mime_type == "application/pdf" and PdfReader is not None:
+        reader = PdfReader(io.BytesIO(file_data))
+        metadata["page_count"] = len(reader.pages)
+        text = ""
+        for page in reader.pages:
+            text += (page.extract_text() or "") + "\n"
+            if len(text) >= max_text_chars:
+                break
+        metadata["text"] = text[:max_text_chars].strip()
+
+    return metadata
+
+
+def get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the process-wide preprocessing pool, creating it with max_workers processes on first use.
+
+    A working pool is never replaced, since another thread may still be submitting to it; later
+    calls with a different size reuse it. A pool broken by a worker crash accepts no more work, so
+    it is replaced. Workers are spawned rather than forked so they do not inherit the server's
+    threads and locks.
+    """
+    global _pool
+    with _lock:
+        if _pool is not None and getattr(_pool, "_broken", False):
+            logger.warning("media preprocessing pool is broken, starting a new one")
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, int(max_workers)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def run_preprocessing(
+    file_data: bytes,
+    mime_type: str,
+    max_workers: int = 2,
+    timeout: float = 15.0,
+    thumbnail_size: int = 320,
+) -> dict:
+    """
+    Runs preprocess_media in the process pool and waits up to timeout seconds.
+
+    :return: the extracted metadata, or an empty dict if preprocessing failed or timed out.
+    """
+    if not (mime_type or "").lower().startswith(("image/", "application/pdf")):
+        return {}
+
+    try:
+        try:
+            future = get_process_pool(max_workers).submit(
+                preprocess_media, file_data, mime_type, thumbnail_size
+            )
+        except BrokenProcessPool:
+            # the pool broke after it was handed out; the next call replaces it
+            future = get_process_pool(max_workers).submit(
+                preprocess_media, file_data, mime_type, thumbnail_size
+            )
+        return future.result(timeout=timeout)
+    except Exception as e:
+        logger.warning(f"media preprocessing failed for {mime_type}: {e}")
+        return {}
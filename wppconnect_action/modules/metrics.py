@@ -0,0 +1,287 @@
+"""In-process counters and latency histograms of gateway calls, with Prometheus text export."""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+# upper bounds, in seconds, of the gateway call latency buckets
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+REQUESTS = "wppconnect_gateway_requests_total"
+DURATION = "wppconnect_gateway_request_duration_seconds"
+REQUEST_BYTES = "wppconnect_gateway_request_bytes_total"
+RESPONSE_BYTES = "wppconnect_gateway_response_bytes_total"
+
+DESCRIPTIONS = {
+    REQUESTS: "Gateway HTTP requests by outcome.",
+    DURATION: "Gateway HTTP request latency in seconds.",
+    REQUEST_BYTES: "Bytes sent in gateway request bodies.",
+    RESPONSE_BYTES: "Bytes received in gateway response bodies.",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Counts observations into fixed buckets and estimates quantiles from them."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """
+        Initializes an empty histogram.
+
+        :param buckets: ascending upper bounds; larger observations fall in an implicit +Inf bucket.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Adds an observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns an estimate of the q-quantile, for q from 0 to 1.
+
+        The estimate interpolates within the quantile's bucket and never exceeds the largest
+        observation.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):
+                    # beyond the last bound only the largest observation is known
+                    return self.max
+                estimate = lower + (self.buckets[index] - lower) * (rank - seen) / count
+                return min(estimate, self.max)
+            seen += count
+        return self.max
+
+    def snapshot(self) -> dict:
+        """Returns the count, mean, estimated p50/p95/p99 and max in milliseconds, and the total seconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 2),
+            "p95_ms": round(self.quantile(0.95) * 1000, 2),
+            "p99_ms": round(self.quantile(0.99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+            "total_s": round(self.sum, 3),
+        }
+
+
+class MetricsRegistry:
+    """Labelled counters and histograms of one process."""
+
+    def __init__(self) -> None:
+        """Initializes an empty registry."""
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted(labels.items()))
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1.0) -> None:
+        """Adds value to the counter name with the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(
+        self,
+        name: str,
+        labels: Dict[str, str],
+        value: float,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        """Adds an observation to the histogram name with the given labels."""
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(buckets)
+            series[key].observe(value)
+
+    def counters(self, name: str) -> Dict[LabelKey, float]:
+        """Returns a copy of the series of counter name."""
+        with self._lock:
+            return dict(self._counters.get(name, {}))
+
+    def histograms(self, name: str) -> Dict[LabelKey, dict]:
+        """Returns snapshots of the series of histogram name."""
+        with self._lock:
+            return {
+                key: histogram.snapshot()
+                for key, histogram in self._histograms.get(name, {}).items()
+            }
+
+    def reset(self) -> None:
+        """Discards every series."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Returns every series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines += [
+                    f"# HELP {name} {DESCRIPTIONS.get(name, name)}",
+                    f"# TYPE {name} counter",
+                ]
+                lines += [
+                    f"{name}{format_labels(key)} {value:g}"
+                    for key, value in sorted(series.items())
+                ]
+            for name, histograms in sorted(self._histograms.items()):
+                lines += [
+                    f"# HELP {name} {DESCRIPTIONS.get(name, name)}",
+                    f"# TYPE {name} histogram",
+                ]
+                for key, histogram in sorted(histograms.items()):
+                    cumulative = 0
+                    bounds = [f"{bound:g}" for bound in histogram.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        labels = format_labels(key + (("le", bound),))
+                        lines.append(f"{name}_bucket{labels} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(key)} {histogram.sum:g}")
+                    lines.append(f"{name}_count{format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(key: LabelKey) -> str:
+    """Returns labels in Prometheus syntax, e.g. {endpoint="send-message"}."""
+    if not key:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in key
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Returns the process-wide metrics registry."""
+    return _registry
+
+
+def endpoint_label(endpoint: str, segments: int = 1) -> str:
+    """
+    Returns the name of a gateway endpoint without its session, ids or secrets.
+
+    :param segments: leading path segments which name a relative endpoint, e.g. 2 for "client/sendMessage/{session}".
+    """
+    if "://" in endpoint:
+        # full URLs embed the session and secret key before the endpoint name
+        return endpoint.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+    return "/".join(endpoint.lstrip("/").split("?", 1)[0].split("/")[:segments])
+
+
+def record_gateway_call(
+    client: str,
+    endpoint: str,
+    method: str,
+    outcome: str,
+    started: Optional[float] = None,
+    response: Any = None,  # noqa: ANN401
+) -> None:
+    """
+    Records one gateway HTTP request.
+
+    :param client: gateway client name, e.g. "WPPConnect".
+    :param endpoint: endpoint label from endpoint_label.
+    :param outcome: ok, throttled, http_4xx, http_5xx, timeout, error or circuit_open.
+    :param started: time.perf_counter() when the request was sent; None if it never was.
+    :param response: the requests.Response, for the request and response body sizes.
+    """
+    registry = _registry
+    labels = {"client": client, "endpoint": endpoint}
+    registry.inc(REQUESTS, {**labels, "method": method, "outcome": outcome})
+    if started is not None:
+        registry.observe(DURATION, labels, time.perf_counter() - started)
+    if response is not None:
+        body = getattr(response.request, "body", None)
+        if body:
+            registry.inc(REQUEST_BYTES, labels, len(body))
+        registry.inc(RESPONSE_BYTES, labels, len(response.content or b""))
+
+
+def http_outcome(status_code: int) -> str:
+    """Returns the outcome label of a failed HTTP response."""
+    return f"http_{status_code // 100}xx"
+
+
+def gateway_call_summary() -> List[dict]:
+    """
+    Returns per-endpoint call counts, outcomes, latency and payload sizes of gateway calls.
+
+    Endpoints are ordered by the total time spent in them, so the calls which dominate
+    gateway latency come first.
+    """
+    registry = _registry
+    summary: Dict[Tuple[str, str], dict] = {}
+
+    def entry(key: LabelKey) -> dict:
+        labels = dict(key)
+        ident = (labels["client"], labels["endpoint"])
+        if ident not in summary:
+            summary[ident] = {
+                "client": ident[0],
+                "endpoint": ident[1],
+                "calls": 0,
+                "outcomes": {},
+                "latency": {},
+                "request_bytes": 0,
+                "response_bytes": 0,
+            }
+        return summary[ident]
+
+    for key, value in registry.counters(REQUESTS).items():
+        item = entry(key)
+        outcome = dict(key)["outcome"]
+        item["calls"] += int(value)
+        item["outcomes"][outcome] = item["outcomes"].get(outcome, 0) + int(value)
+    for key, snapshot in registry.histograms(DURATION).items():
+        entry(key)["latency"] = snapshot
+    for name, field in (
+        (REQUEST_BYTES, "request_bytes"),
+        (RESPONSE_BYTES, "response_bytes"),
+    ):
+        for key, value in registry.counters(name).items():
+            entry(key)[field] += int(value)
+    return sorted(
+        summary.values(),
+        key=lambda item: item["latency"].get("total_s", 0.0),
+        reverse=True,
+    )
@@ -0,0 +1,141 @@
+"""Adaptive send-rate limiting for WhatsApp gateway sessions."""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+THROTTLE_STATUS_CODES = {429, 503}
+THROTTLE_MARKERS = ("rate-overlimit", "rate limit", "too many requests")
+
+
+class AdaptiveRateLimiter:
+    """
+    Spaces out sends for a single session using AIMD.
+
+    Each successful send raises the rate additively; each throttled send cuts it
+    multiplicatively, and a Retry-After hint blocks all sends until it elapses. Under
+    steady load the rate settles just below the point where the gateway pushes back.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        min_rate: float = 0.2,
+        max_rate: float = 5.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+    ) -> None:
+        """
+        Initializes the limiter.
+
+        :param rate: Initial sends per second.
+        :param min_rate: Floor for the send rate.
+        :param max_rate: Ceiling for the send rate.
+        :param increase: Sends per second added after each successful send.
+        :param decrease: Factor applied to the rate after each throttled send.
+        """
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, min_rate: float, max_rate: float) -> None:
+        """Updates the rate bounds, keeping the learned rate within them."""
+        with self._lock:
+            self.min_rate = min_rate
+            self.max_rate = max(max_rate, min_rate)
+            self.rate = min(max(self.rate, self.min_rate), self.max_rate)
+
+    def acquire(self) -> float:
+        """Blocks until the next send slot is available; returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._blocked_until)
+            self._next_slot = slot + 1.0 / self.rate
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+    def on_success(self) -> None:
+        """Additively increases the send rate."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicatively decreases the send rate and honours any Retry-After hint."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if retry_after:
+                self._blocked_until = max(
+                    self._blocked_until, time.monotonic() + retry_after
+                )
+
+    def snapshot(self) -> dict:
+        """Returns the current limiter state."""
+        with self._lock:
+            return {
+                "rate": round(self.rate, 3),
+                "min_rate": self.min_rate,
+                "max_rate": self.max_rate,
+                "blocked_for": round(
+                    max(self._blocked_until - time.monotonic(), 0.0), 3
+                ),
+            }
+
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_limiter(
+    key: str, rate: float = 1.0, min_rate: float = 0.2, max_rate: float = 5.0
+) -> AdaptiveRateLimiter:
+    """
+    Returns the process-wide limiter for key (typically api_url/session), creating it on first use.
+
+    API clients are created per call, so the limiter must outlive them to keep what it has learned.
+    """
+    with _registry_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(
+                rate=rate, min_rate=min_rate, max_rate=max_rate
+            )
+            _limiters[key] = limiter
+        elif (limiter.min_rate, limiter.max_rate) != (min_rate, max_rate):
+            limiter.configure(min_rate=min_rate, max_rate=max_rate)
+        return limiter
+
+
+def is_throttled(status_code: int, text: str = "") -> bool:
+    """Returns True if a gateway response indicates the send was rejected for rate reasons."""
+    if status_code in THROTTLE_STATUS_CODES:
+        return True
+    if status_code >= 400 and text:
+        lowered = text[:2048].lower()
+        return any(marker in lowered for marker in THROTTLE_MARKERS)
+    return False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    if value.strip().replace(".", "", 1).isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Returns a full-jitter exponential backoff delay for the given retry attempt (1-based)."""
+    return random.uniform(0, min(cap, base * (2 ** max(attempt - 1, 0))))
@@ -0,0 +1,96 @@
+"""Steps of the gateway session registration state machine."""
+
+import time
+from typing import Any, Optional
+
+from .rate_limiter import backoff_delay
+
+CHECK_STATUS = "CHECK_STATUS"
+GENERATE_TOKEN = "GENERATE_TOKEN"
+CLOSE_SESSION = "CLOSE_SESSION"
+START_SESSION = "START_SESSION"
+FETCH_QRCODE = "FETCH_QRCODE"
+FETCH_DEVICE = "FETCH_DEVICE"
+SYNC_PROFILE = "SYNC_PROFILE"
+AWAITING_SCAN = "AWAITING_SCAN"
+CONNECTED = "CONNECTED"
+DONE = "DONE"
+FAILED = "FAILED"
+
+TERMINAL_STEPS = frozenset({AWAITING_SCAN, CONNECTED, DONE, FAILED})
+
+
+def is_terminal(registration: Optional[dict]) -> bool:
+    """Returns True if the registration is finished, or was never started."""
+    return not registration or registration.get("step") in TERMINAL_STEPS
+
+
+def next_state(registration: dict, step: str, **updates: Any) -> dict:  # noqa: ANN401
+    """Returns a copy of registration moved on to step, with updates applied and its retry count reset."""
+    state = {
+        key: value
+        for key, value in registration.items()
+        if key not in ("attempts", "error", "retry_in")
+    }
+    state.update(updates)
+    state["step"] = step
+    return state
+
+
+def retry_state(
+    registration: dict, error: str, max_attempts: int = 3, retry_delay: float = 2.0
+) -> dict:
+    """
+    Returns registration queued to retry its current step after a backoff delay.
+
+    :return: the retry state, or a FAILED state once max_attempts have been made.
+    """
+    attempts = registration.get("attempts", 0) + 1
+    if attempts >= max_attempts:
+        return next_state(
+            registration,
+            FAILED,
+            status="ERROR",
+            message=f"Session registration failed at {registration.get('step')}: {error}",
+            error=error,
+        )
+    state = dict(registration)
+    state.update(
+        attempts=attempts,
+        error=error,
+        retry_in=backoff_delay(attempts, base=retry_delay),
+    )
+    return state
+
+
+def run_registration(
+    client: Any,  # noqa: ANN401
+    webhook_url: str = "",
+    wait_qr_code: bool = True,
+    auto_register: bool = True,
+    status_resp: Optional[dict] = None,
+    max_attempts: int = 3,
+    retry_delay: float = 2.0,
+) -> dict:
+    """
+    Runs client.registration_step from CHECK_STATUS until the registration finishes, blocking.
+
+    :return: the final registration state.
+    """
+    registration = {
+        "step": CHECK_STATUS,
+        "wait_qr_code": wait_qr_code,
+        "auto_register": auto_register,
+    }
+    while not is_terminal(registration):
+        registration = client.registration_step(
+            registration,
+            webhook_url=webhook_url,
+            status_resp=status_resp,
+            max_attempts=max_attempts,
+            retry_delay=retry_delay,
+        )
+        status_resp = None
+        if registration.get("retry_in"):
+            time.sleep(registration["retry_in"])
+    return registration
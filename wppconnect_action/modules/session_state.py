@@ -0,0 +1,229 @@
+"""Process-wide cache of WhatsApp gateway session state (status, QR code, device)."""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .cache import RedisCache, get_cache
+
+
+class SessionStateStore:
+    """
+    Holds the last known state of each gateway session.
+
+    State is refreshed either by polling the gateway (when the cached copy is older than the
+    caller's max_age) or by session-state webhooks, which update it as soon as it changes.
+    Every change bumps a per-session version and records a transition, so clients can
+    long-poll with wait_for_change instead of re-polling the gateway.
+
+    Without a shared cache, versions and waiters are local to the process, so long-polls only
+    see webhooks received by the same worker; multi-worker deployments must set a shared cache
+    (see cache.configure_cache). With one, the state, its version and its transitions are kept
+    in the shared cache. Each change is a compare-and-set of the whole entry there, so
+    concurrent updates from several workers are never lost, every worker reports the same
+    version for the same state, and waiters poll the shared version. The
+    local copy and condition variable then only save round trips for changes made by this
+    worker.
+    """
+
+    def __init__(
+        self, max_transitions: int = 50, shared_poll_interval: float = 0.5
+    ) -> None:
+        """
+        Initializes an empty store.
+
+        :param max_transitions: number of status transitions kept per session.
+        :param shared_poll_interval: seconds between checks of the shared version while waiting.
+        """
+        self._states: Dict[str, dict] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+        self._transitions: Dict[str, Deque[dict]] = {}
+        self._max_transitions = max_transitions
+        self._shared_poll_interval = shared_poll_interval
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[dict]:
+        """
+        Returns a copy of the cached state for key.
+
+        :param max_age: seconds after which the cached state is considered stale; None accepts any age.
+        :return: the state, or None if it is missing or stale.
+        """
+        self._sync(key)
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None and (
+                max_age is None or time.monotonic() - self._updated_at[key] <= max_age
+            ):
+                return dict(state)
+        return None
+
+    def update(self, key: str, state: dict, replace: bool = False) -> dict:
+        """
+        Merges state into the cached state for key.
+
+        Bumps the version of key and wakes any waiters only if the state actually changed.
+
+        :param replace: discard the previously cached state instead of merging into it.
+        :return: a copy of the resulting state.
+        """
+        shared = get_shared_states()
+        if shared is not None:
+
+            def merge(entry: Optional[dict]) -> dict:
+                # merges into the freshest copy, from whichever worker last updated it; the
+                # shared cache re-runs this if another worker updates the entry meanwhile
+                entry = entry or {}
+                previous = entry.get("state") or {}
+                current = {} if replace else dict(previous)
+                current.update(state)
+                version = entry.get("version", 0)
+                transitions = list(entry.get("transitions") or [])
+                if current != previous or not version:
+                    version += 1
+                    if current.get("status") != previous.get("status"):
+                        transitions.append(
+                            {
+                                "version": version,
+                                "status": current.get("status"),
+                                "at": time.time(),
+                            }
+                        )
+                return {
+                    "state": current,
+                    "updated_at": time.time(),
+                    "version": version,
+                    "transitions": transitions[-self._max_transitions :],
+                }
+
+            # entries never expire, so versions never move backwards
+            if (entry := shared.update(key, merge, ttl=0)) is not None:
+                with self._lock:
+                    return self._adopt(key, entry)
+            # the shared cache is unreachable, so the change is only recorded locally
+
+        with self._lock:
+            current = {} if replace else dict(self._states.get(key, {}))
+            current.update(state)
+            return self._apply(key, current, time.monotonic())
+
+    def _apply(self, key: str, current: dict, updated_at: float) -> dict:
+        # stores current as the state of key; the caller holds the lock
+        previous = self._states.get(key, {})
+        self._states[key] = current
+        self._updated_at[key] = updated_at
+        if current != previous or key not in self._versions:
+            version = self._versions.get(key, 0) + 1
+            self._versions[key] = version
+            if current.get("status") != previous.get("status"):
+                self._transitions.setdefault(
+                    key, deque(maxlen=self._max_transitions)
+                ).append(
+                    {
+                        "version": version,
+                        "status": current.get("status"),
+                        "at": time.time(),
+                    }
+                )
+            self._changed.notify_all()
+        return dict(current)
+
+    def _adopt(self, key: str, entry: dict) -> dict:
+        # stores a shared cache entry as the local copy of key; the caller holds the lock
+        age = max(0.0, time.time() - entry["updated_at"])
+        self._states[key] = dict(entry["state"])
+        self._updated_at[key] = time.monotonic() - age
+        self._transitions[key] = deque(
+            entry.get("transitions") or [], maxlen=self._max_transitions
+        )
+        if self._versions.get(key) != entry["version"]:
+            self._versions[key] = entry["version"]
+            self._changed.notify_all()
+        return dict(entry["state"])
+
+    def _sync(self, key: str) -> None:
+        # refreshes the local copy of key from the shared cache, if there is one
+        shared = get_shared_states()
+        entry = shared.get(key) if shared is not None else None
+        if entry:
+            with self._lock:
+                self._adopt(key, entry)
+
+    def version(self, key: str) -> int:
+        """Returns the current version of key; 0 if nothing was ever recorded for it."""
+        self._sync(key)
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def transitions(self, key: str, since_version: int = 0) -> List[dict]:
+        """Returns the status transitions of key recorded after since_version, oldest first."""
+        self._sync(key)
+        with self._lock:
+            return [
+                dict(transition)
+                for transition in self._transitions.get(key, ())
+                if transition["version"] > since_version
+            ]
+
+    def wait_for_change(
+        self, key: str, since_version: int, timeout: float
+    ) -> Tuple[int, Optional[dict]]:
+        """
+        Blocks until the version of key differs from since_version or timeout seconds pass.
+
+        A since_version ahead of the store (e.g. from before a restart) returns immediately.
+        With a shared cache, the shared version is checked every shared_poll_interval seconds,
+        so changes recorded by other workers wake the wait too.
+
+        :return: the current version and a copy of the state (None if nothing is cached).
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        shared = get_shared_states() is not None
+        while True:
+            self._sync(key)
+            with self._changed:
+                remaining = deadline - time.monotonic()
+                if self._versions.get(key, 0) == since_version and remaining > 0:
+                    self._changed.wait_for(
+                        lambda: self._versions.get(key, 0) != since_version,
+                        timeout=(
+                            min(remaining, self._shared_poll_interval)
+                            if shared
+                            else remaining
+                        ),
+                    )
+                version = self._versions.get(key, 0)
+                if version != since_version or time.monotonic() >= deadline:
+                    state = self._states.get(key)
+                    return version, (dict(state) if state is not None else None)
+
+    def invalidate(self, key: str) -> None:
+        """Marks the cached state for key as stale so the next read polls the gateway."""
+        with self._lock:
+            if key in self._updated_at:
+                self._updated_at[key] = float("-inf")
+        shared = get_shared_states()
+        if shared is not None:
+            # the entry is kept, with its version and transitions, so versions never move backwards
+            shared.update(
+                key,
+                lambda entry: {**entry, "updated_at": 0.0} if entry else None,
+                ttl=0,
+            )
+
+
+_store = SessionStateStore()
+
+
+def get_shared_states() -> Optional[RedisCache]:
+    """Returns the cache the session states are shared through, or None if caches are in-process."""
+    cache = get_cache("session_state", ttl=86400)
+    return cache if isinstance(cache, RedisCache) else None
+
+
+def get_session_store() -> SessionStateStore:
+    """Returns the process-wide session state store."""
+    return _store
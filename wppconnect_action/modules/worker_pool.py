@@ -0,0 +1,55 @@
+"""Bounded, named worker pools shared by the action for concurrent gateway work."""
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+_executors: Dict[Tuple[str, int], ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+
+def get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """
+    Returns the process-wide thread pool of name and size, creating it on first use.
+
+    Pools are keyed by size as well as name, so callers configured with different sizes each
+    keep their own pool; a pool is never shut down while another thread may still submit to it.
+    """
+    max_workers = max(1, int(max_workers))
+    key = (name, max_workers)
+    with _lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=f"wpp-{name}"
+            )
+            _executors[key] = executor
+        return executor
+
+
+def submit(
+    name: str,
+    max_workers: int,
+    fn: Callable[..., Any],
+    *args: Any,  # noqa: ANN401
+    propagate_context: bool = False,
+    isolate_context: bool = False,
+    **kwargs: Any,  # noqa: ANN401
+) -> Future:
+    """
+    Submits fn to the named pool.
+
+    :param propagate_context: run fn in a copy of the caller's contextvars. The copy still
+        refers to the caller's request context, which is not thread-safe, so fn must not touch
+        the graph.
+    :param isolate_context: run fn in an empty contextvars context, e.g. for tasks which open
+        their own request context and must not see one left behind on a reused worker thread.
+    """
+    executor = get_executor(name, max_workers)
+    if propagate_context:
+        ctx = contextvars.copy_context()
+        return executor.submit(ctx.run, fn, *args, **kwargs)
+    if isolate_context:
+        return executor.submit(contextvars.Context().run, fn, *args, **kwargs)
+    return executor.submit(fn, *args, **kwargs)
@@ -12,6 +12,11 @@ import filetype
 import requests
 from dotenv import load_dotenv
 
+from . import registration
+from .circuit_breaker import CIRCUIT_OPEN_ERROR, get_breaker
+from .metrics import endpoint_label, http_outcome, record_gateway_call
+from .rate_limiter import backoff_delay, get_limiter, is_throttled, parse_retry_after
+
 load_dotenv()
 
 
@@ -20,6 +25,32 @@ class WPPConnectAPI:
 
     logger = logging.getLogger(__name__)
 
+    # endpoints which deliver chat messages and are subject to send rate limiting;
+    # read receipts (send-seen) and status posts (send-status) are not paced with replies
+    SEND_ENDPOINTS = frozenset(
+        {
+            "send-message",
+            "send-reply",
+            "send-image",
+            "send-file",
+            "send-file-base64",
+            "send-voice",
+            "send-voice-base64",
+            "send-location",
+            "send-contact",
+            "send-link-preview",
+            "send-mentioned",
+            "send-buttons",
+            "send-list-message",
+            "send-order-message",
+            "send-poll-message",
+        }
+    )
+    # lightweight endpoints let through an open circuit to probe gateway recovery
+    PROBE_ENDPOINT_PREFIXES = ("check-connection-session",)
+    # leading path segments which name an endpoint in call metrics
+    METRIC_ENDPOINT_SEGMENTS = 1
+
     def __init__(
         self,
         api_url: str,
@@ -27,6 +58,12 @@ class WPPConnectAPI:
         token: str,
         secret_key: Optional[str] = None,
         timeout: float = 10.0,
+        send_rate: float = 0.0,
+        send_rate_min: float = 0.2,
+        send_rate_max: float = 5.0,
+        send_retries: int = 0,
+        circuit_failure_threshold: int = 0,
+        circuit_reset_timeout: float = 30.0,
     ) -> None:
         """
         Initializes the WPPConnectAPI object with base URL, instance, and credentials.
@@ -35,12 +72,38 @@ class WPPConnectAPI:
         :param session: WPPConnect instance ID.
         :param token: API authentication key.
         :param secret_key: Master key for instance creation (if any).
+        :param send_rate: Initial sends per second for this session; 0 disables rate limiting.
+        :param send_rate_min: Lowest send rate the adaptive limiter may back off to.
+        :param send_rate_max: Highest send rate the adaptive limiter may climb to.
+        :param send_retries: Number of retries for sends rejected by throttling.
+        :param circuit_failure_threshold: Consecutive gateway failures which open the circuit; 0 disables it.
+        :param circuit_reset_timeout: Seconds an open circuit fails fast before allowing a trial request.
         """
         self.api_url = api_url.rstrip("/")
         self.session = session
         self.token = token
         self.secret_key = secret_key or os.environ.get("WPP_SECRET_KEY", "")
         self.timeout = timeout
+        self.send_retries = send_retries
+        self.limiter = (
+            get_limiter(
+                f"{self.api_url}/{self.session}",
+                rate=send_rate,
+                min_rate=send_rate_min,
+                max_rate=send_rate_max,
+            )
+            if send_rate > 0
+            else None
+        )
+        self.breaker = (
+            get_breaker(
+                self.api_url,
+                failure_threshold=circuit_failure_threshold,
+                reset_timeout=circuit_reset_timeout,
+            )
+            if circuit_failure_threshold > 0
+            else None
+        )
 
     def send_rest_request(
         self,
@@ -67,34 +130,175 @@ class WPPConnectAPI:
         json_payload = data if json_body else None
         body = None if json_body else data
 
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=json_payload,
-                data=body,
-                params=params,
-                timeout=self.timeout,  # request timeout
+        # every attempt is counted and timed per endpoint
+        label = endpoint_label(endpoint, self.METRIC_ENDPOINT_SEGMENTS)
+
+        # fail fast while the gateway is known to be down
+        breaker = self.breaker
+        if breaker and not breaker.allow_request(
+            probe=self.is_probe_endpoint(endpoint)
+        ):
+            self.logger.warning(
+                f"WPPConnect circuit open, skipping {endpoint} "
+                f"(retry in {breaker.retry_in():.1f}s)"
             )
-            response.raise_for_status()
-            if response.content:
+            record_gateway_call("WPPConnect", label, method, "circuit_open")
+            return {"ok": False, "error": CIRCUIT_OPEN_ERROR}
+
+        # sends are retried when throttled, up to send_retries times, and paced by the
+        # session's adaptive limiter when send_rate is set
+        is_send = self.is_send_endpoint(endpoint)
+        limiter = self.limiter if is_send else None
+        attempt = 0
+
+        # the trial call of a half-open circuit is always settled, even if something other than the
+        # request itself raises, so the circuit can never be left waiting on it
+        try:
+            while True:
+                if limiter:
+                    limiter.acquire()
+                started = time.perf_counter()
                 try:
-                    return response.json()
-                except Exception:
-                    return {"ok": True, "raw": response.content}
-            return {"ok": True, "no_content": True}
-        except requests.Timeout:
-            self.logger.error(
-                f"WPPConnect request timed out after {self.timeout} seconds."
-            )
-            return {"ok": False, "error": f"Timeout after {self.timeout} seconds"}
-        except requests.RequestException as e:
-            self.logger.error(f"WPPConnect request error: {str(e)}")
-            return {"ok": False, "error": str(e)}
+                    response = requests.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        json=json_payload,
+                        data=body,
+                        params=params,
+                        timeout=self.timeout,  # request timeout
+                    )
+                    if is_send and is_throttled(response.status_code, response.text):
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                        if limiter:
+                            limiter.on_throttle(retry_after)
+                        if attempt < self.send_retries:
+                            record_gateway_call(
+                                "WPPConnect",
+                                label,
+                                method,
+                                "throttled",
+                                started,
+                                response,
+                            )
+                            attempt += 1
+                            delay = backoff_delay(attempt)
+                            if not limiter and retry_after:
+                                # without a limiter to hold sends back, the gateway's hint is waited out here
+                                delay = max(delay, min(retry_after, 30.0))
+                            self.logger.warning(
+                                f"WPPConnect throttled {endpoint} (HTTP {response.status_code}), "
+                                f"retry {attempt}/{self.send_retries} in {delay:.2f}s"
+                            )
+                            time.sleep(delay)
+                            continue
+                    response.raise_for_status()
+                    record_gateway_call(
+                        "WPPConnect", label, method, "ok", started, response
+                    )
+                    if breaker:
+                        breaker.record_success()
+                    if limiter:
+                        limiter.on_success()
+                    if response.content:
+                        try:
+                            return response.json()
+                        except Exception:
+                            return {"ok": True, "raw": response.content}
+                    return {"ok": True, "no_content": True}
+                except requests.HTTPError as e:
+                    record_gateway_call(
+                        "WPPConnect",
+                        label,
+                        method,
+                        (
+                            http_outcome(e.response.status_code)
+                            if e.response is not None
+                            else "error"
+                        ),
+                        started,
+                        e.response,
+                    )
+                    # the gateway answered, so only server errors count against the circuit
+                    if breaker:
+                        if e.response is not None and e.response.status_code >= 500:
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success()
+                    self.logger.error(f"WPPConnect request error: {str(e)}")
+                    return {"ok": False, "error": str(e)}
+                except requests.Timeout:
+                    record_gateway_call("WPPConnect", label, method, "timeout", started)
+                    if breaker:
+                        breaker.record_failure()
+                    self.logger.error(
+                        f"WPPConnect request timed out after {self.timeout} seconds."
+                    )
+                    return {
+                        "ok": False,
+                        "error": f"Timeout after {self.timeout} seconds",
+                    }
+                except requests.RequestException as e:
+                    record_gateway_call("WPPConnect", label, method, "error", started)
+                    if breaker:
+                        breaker.record_failure()
+                    self.logger.error(f"WPPConnect request error: {str(e)}")
+                    return {"ok": False, "error": str(e)}
+        finally:
+            if breaker:
+                breaker.release_trial()
+
+    def is_probe_endpoint(self, endpoint: str) -> bool:
+        """Returns True if the endpoint is a connection check allowed through an open circuit."""
+        return endpoint.lstrip("/").startswith(self.PROBE_ENDPOINT_PREFIXES)
+
+    def is_send_endpoint(self, endpoint: str) -> bool:
+        """Returns True if the endpoint delivers a message and is subject to send rate limiting."""
+        return endpoint.lstrip("/").split("?", 1)[0] in self.SEND_ENDPOINTS
 
     # Utility
 
+    # status-find values reported by WPPConnect mapped to session status
+    SESSION_STATUS_EVENTS = {
+        "isLogged": "CONNECTED",
+        "inChat": "CONNECTED",
+        "qrReadSuccess": "CONNECTED",
+        "successChat": "CONNECTED",
+        "notLogged": "QRCODE",
+        "qrReadFail": "QRCODE",
+        "desconnectedMobile": "DISCONNECTED",
+        "deleteToken": "DISCONNECTED",
+        "browserClose": "CLOSED",
+        "autocloseCalled": "CLOSED",
+        "serverClose": "CLOSED",
+    }
+
+    @staticmethod
+    def parse_session_event(request: dict) -> dict:
+        """
+        Parses a session-state webhook payload (status-find, qrcode).
+
+        Returns:
+            dict: session state fields ("status", and "qrcode" when a new QR code was issued),
+            or an empty dict if the payload is not a session-state event.
+        """
+        event = request.get("event")
+        if event == "qrcode":
+            return {"status": "QRCODE", "qrcode": request.get("qrcode")}
+        if event == "status-find":
+            status = WPPConnectAPI.SESSION_STATUS_EVENTS.get(request.get("status", ""))
+            return {"status": status} if status else {}
+        if event == "session-logged":
+            return {"status": "CONNECTED"}
+        return {}
+
+    @staticmethod
+    def get_webhook_session(request: dict) -> str:
+        """Returns the name of the WPPConnect session a webhook payload was sent for, or "" if it is not given."""
+        return str(request.get("session") or "")
+
     @staticmethod
     def parse_inbound_message(request: dict) -> dict:
         """Parses an inbound message request payload and returns extracted values."""
@@ -301,82 +505,140 @@ class WPPConnectAPI:
         webhook_url: str = "",
         wait_qr_code: bool = True,
         auto_register: bool = True,
+        status_resp: Optional[dict] = None,
     ) -> dict:
         """
-        Initializes the WPPConnect session:
-        1. Checks session status.
-        2. If not active, creates a token (if required), starts the session, and fetches QR code.
-        3. If active, returns number/session info.
+        Initializes the WPPConnect session, running every registration step in turn.
+
+        A recent status response may be supplied to skip the initial status request.
         Returns a dict with status, and either QR code (for scan) or bound device info.
         """
-        # 1. Get session status
-        status_resp = self.status()
-        status = status_resp.get("status", "").upper()
-        # Optionally generate instance/token if needed
-        if "Unauthorized" in str(status_resp.get("error", "")) or status == "":
-            # This corresponds to a missing/invalid token, so attempt to create instance/token
-            create_res = self.create_session()
-            if not create_res.get("token"):
-                return {
-                    "status": "ERROR",
-                    "message": "Could not create instance or get token.",
-                    "details": create_res,
-                }
-            self.token = create_res["token"]
+        return registration.run_registration(
+            self,
+            webhook_url=webhook_url,
+            wait_qr_code=wait_qr_code,
+            auto_register=auto_register,
+            status_resp=status_resp,
+        )
 
-            status_resp = self.status()
-            status = status_resp.get("status", "").upper()
+    def registration_step(
+        self,
+        state: dict,
+        webhook_url: str = "",
+        status_resp: Optional[dict] = None,
+        max_attempts: int = 3,
+        retry_delay: float = 2.0,
+    ) -> dict:
+        """
+        Runs the registration step named by state["step"] and returns the next state.
 
-        # These status keys may vary depending on your WPPConnect version
-        # Active/connected session
-        if status == "CONNECTED":
+        1. CHECK_STATUS checks session status, unless a recent status response is supplied.
+        2. GENERATE_TOKEN creates a token when the session is missing or unauthorized.
+        3. START_SESSION starts the session with the webhook; failures are retried with backoff.
+        4. FETCH_QRCODE or FETCH_DEVICE finish the registration, awaiting a scan or connected.
+        """
+        step = state.get("step", registration.CHECK_STATUS)
 
-            # start session with new webhook
-            start_res = self.start_session(
-                webhook=webhook_url, wait_qr_code=wait_qr_code
+        if step == registration.CHECK_STATUS:
+            if status_resp is None:
+                status_resp = self.status()
+            status = status_resp.get("status", "").upper()
+            if (
+                "Unauthorized" in str(status_resp.get("error", "")) or status == ""
+            ) and not state.get("token_generated"):
+                # a missing/invalid token, so attempt to create instance/token
+                return registration.next_state(state, registration.GENERATE_TOKEN)
+            # a connected session is restarted only to register the webhook
+            if status == "CONNECTED" or (
+                status in {"QRCODE", "DISCONNECTED", "CLOSED", ""}
+                and state.get("auto_register", True)
+            ):
+                return registration.next_state(
+                    state,
+                    registration.START_SESSION,
+                    status=status,
+                    connected=status == "CONNECTED",
+                )
+            return registration.next_state(
+                state,
+                registration.DONE,
+                status=status,
+                message=f"Session status: {status}",
+                details=status_resp,
+                qrcode=status_resp.get("qrcode"),
             )
 
-            if start_res.get("status") == "CONNECTED":
-                # Get the host device info/number
-                device_info = self.get_host_device()
-                return {
-                    "status": "CONNECTED",
-                    "message": "Session is already active and connected.",
-                    "device": device_info,
-                    "session": self.session,
-                    "token": self.token,
-                }
-            return start_res
-        # Some deployments may say "QRCODE" or "DISCONNECTED" or "CLOSED"
-        elif status in {"QRCODE", "DISCONNECTED", "CLOSED", ""} and auto_register:
-            # Start the session, register webhook, and request QR code
-            start_res = self.start_session(
-                webhook=webhook_url, wait_qr_code=wait_qr_code
+        if step == registration.GENERATE_TOKEN:
+            create_res = self.create_session()
+            if not create_res.get("token"):
+                return registration.next_state(
+                    state,
+                    registration.FAILED,
+                    status="ERROR",
+                    message="Could not create instance or get token.",
+                    details=create_res,
+                )
+            self.token = create_res["token"]
+            return registration.next_state(
+                state,
+                registration.CHECK_STATUS,
+                token=self.token,
+                token_generated=True,
             )
 
-            if start_res.get("qrcode"):
-                # Some deployments return QR code directly
-                qrcode_b64 = start_res["qrcode"]
-            else:
-                # Otherwise, get it from /qrcode-session
-                qr_resp = self.qrcode()
-                qrcode_b64 = qr_resp.get("qrcode")
-
-            return {
+        if step == registration.START_SESSION:
+            connected = state.get("connected", False)
+            start_res = self.start_session(
+                webhook=webhook_url,
+                wait_qr_code=state.get("wait_qr_code", True) and not connected,
+            )
+            if not start_res.get("status"):
+                return registration.retry_state(
+                    state,
+                    str(start_res.get("error") or "start-session failed"),
+                    max_attempts=max_attempts,
+                    retry_delay=retry_delay,
+                )
+            if connected:
+                if start_res.get("status") == "CONNECTED":
+                    return registration.next_state(state, registration.FETCH_DEVICE)
+                return registration.next_state(state, registration.DONE, **start_res)
+            awaiting = {
                 "status": "AWAITING_QR_SCAN",
                 "message": "Session created or started. Awaiting QR Code scan.",
-                "qrcode": qrcode_b64,
                 "session": self.session,
-                "token": self.token,
             }
+            if start_res.get("qrcode"):
+                # Some deployments return QR code directly
+                return registration.next_state(
+                    state,
+                    registration.AWAITING_SCAN,
+                    qrcode=start_res["qrcode"],
+                    **awaiting,
+                )
+            return registration.next_state(state, registration.FETCH_QRCODE, **awaiting)
+
+        if step == registration.FETCH_QRCODE:
+            # Otherwise, get it from /qrcode-session
+            qr_resp = self.qrcode()
+            return registration.next_state(
+                state,
+                registration.AWAITING_SCAN,
+                qrcode=qr_resp.get("qrcode_base64") or qr_resp.get("qrcode"),
+            )
 
-        # Some other status
-        return {
-            "status": status,
-            "message": f"Session status: {status}",
-            "details": status_resp,
-            "qrcode": status_resp.get("qrcode"),
-        }
+        if step == registration.FETCH_DEVICE:
+            # Get the host device info/number
+            return registration.next_state(
+                state,
+                registration.CONNECTED,
+                status="CONNECTED",
+                message="Session is already active and connected.",
+                device=self.get_host_device(),
+                session=self.session,
+            )
+
+        return state
 
     # 1. Instance/session related
 
@@ -411,12 +673,7 @@ class WPPConnectAPI:
     def start_session(self, webhook: str = "", wait_qr_code: bool = False) -> dict:
         """POST /start-session"""
         data = {"webhook": webhook, "waitQrCode": wait_qr_code}
-        result = self.send_rest_request("start-session", data=data)
-        if result.get("status"):
-            return result
-        else:
-            result = self.send_rest_request("start-session", data=data)
-            return result
+        return self.send_rest_request("start-session", data=data)
 
     def close_session(self) -> dict:
         """POST /close-session"""
@@ -611,9 +868,16 @@ class WPPConnectAPI:
         return self.send_rest_request("send-voice", data=data)
 
     def send_voice_base64(
-        self, phone: str, base64_ptt: str, is_group: bool = False
+        self, phone: str, base64_ptt: str, is_group: bool = False, mime_type: str = ""
     ) -> dict:
-        """POST /send-voice-base64"""
+        """
+        POST /send-voice-base64
+
+        Args:
+            mime_type (str): Optional; MIME type of the audio, sent as a data URI prefix.
+        """
+        if mime_type and not base64_ptt.startswith("data:"):
+            base64_ptt = f"data:{mime_type};base64,{base64_ptt}"
         data = {"phone": phone, "isGroup": is_group, "base64Ptt": base64_ptt}
         return self.send_rest_request("send-voice-base64", data=data)
 
@@ -22,6 +22,11 @@ import filetype
 import requests
 from dotenv import load_dotenv
 
+from . import registration
+from .circuit_breaker import CIRCUIT_OPEN_ERROR, get_breaker
+from .metrics import endpoint_label, http_outcome, record_gateway_call
+from .rate_limiter import backoff_delay, get_limiter, is_throttled, parse_retry_after
+
 load_dotenv()
 
 
@@ -30,6 +35,13 @@ class WWebJSAPI:
 
     logger = logging.getLogger(__name__)
 
+    # endpoints which deliver messages and are subject to send rate limiting
+    SEND_ENDPOINT_PREFIXES = ("client/sendMessage/",)
+    # lightweight endpoints let through an open circuit to probe gateway recovery
+    PROBE_ENDPOINT_PREFIXES = ("client/getState/",)
+    # leading path segments which name an endpoint in call metrics
+    METRIC_ENDPOINT_SEGMENTS = 2
+
     def __init__(
         self,
         api_url: str,
@@ -37,6 +49,12 @@ class WWebJSAPI:
         token: str,
         secret_key: Optional[str] = None,
         timeout: float = 10.0,
+        send_rate: float = 0.0,
+        send_rate_min: float = 0.2,
+        send_rate_max: float = 5.0,
+        send_retries: int = 0,
+        circuit_failure_threshold: int = 0,
+        circuit_reset_timeout: float = 30.0,
     ) -> None:
         """
         Initialize the API wrapper.
@@ -47,12 +65,38 @@ class WWebJSAPI:
             token: API key for authentication (x-api-key header)
             secret_key: Not used in WWebJS, kept for compatibility
             timeout: Request timeout in seconds
+            send_rate: Initial sends per second for this session; 0 disables rate limiting
+            send_rate_min: Lowest send rate the adaptive limiter may back off to
+            send_rate_max: Highest send rate the adaptive limiter may climb to
+            send_retries: Number of retries for sends rejected by throttling
+            circuit_failure_threshold: Consecutive gateway failures which open the circuit; 0 disables it
+            circuit_reset_timeout: Seconds an open circuit fails fast before allowing a trial request
         """
         self.api_url = api_url.rstrip("/")
         self.session = session
         self.token = token
         self.secret_key = secret_key or os.environ.get("WPP_SECRET_KEY", "")
         self.timeout = timeout
+        self.send_retries = send_retries
+        self.limiter = (
+            get_limiter(
+                f"{self.api_url}/{self.session}",
+                rate=send_rate,
+                min_rate=send_rate_min,
+                max_rate=send_rate_max,
+            )
+            if send_rate > 0
+            else None
+        )
+        self.breaker = (
+            get_breaker(
+                self.api_url,
+                failure_threshold=circuit_failure_threshold,
+                reset_timeout=circuit_reset_timeout,
+            )
+            if circuit_failure_threshold > 0
+            else None
+        )
 
     def _format_chat_id(self, phone: str, is_group: bool = False) -> str:
         """Format phone number to WWebJS chat ID format."""
@@ -72,7 +116,7 @@ class WWebJSAPI:
         use_full_url: bool = False,
     ) -> dict:
         """Generic HTTP request to WWebJS API."""
-        self.logger.info(f"Making {method} request to endpoint: {endpoint}")
+        self.logger.debug(f"Making {method} request to endpoint: {endpoint}")
         self.logger.debug(f"Request data: {data}")
         self.logger.debug(f"Request params: {params}")
 
@@ -101,40 +145,176 @@ class WWebJSAPI:
         self.logger.debug(f"Full URL: {url}")
         self.logger.debug(f"Headers: {headers}")
 
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=json_payload,
-                data=body,
-                params=params,
-                timeout=self.timeout,
+        # every attempt is counted and timed per endpoint
+        label = endpoint_label(endpoint, self.METRIC_ENDPOINT_SEGMENTS)
+
+        # fail fast while the gateway is known to be down
+        breaker = self.breaker
+        if breaker and not breaker.allow_request(
+            probe=self.is_probe_endpoint(endpoint)
+        ):
+            self.logger.warning(
+                f"WWebJS circuit open, skipping {endpoint} "
+                f"(retry in {breaker.retry_in():.1f}s)"
             )
-            self.logger.info(f"Response status: {response.status_code}")
-            response.raise_for_status()
-            if response.content:
+            record_gateway_call("WWebJS", label, method, "circuit_open")
+            return {"ok": False, "error": CIRCUIT_OPEN_ERROR}
+
+        # sends are retried when throttled, up to send_retries times, and paced by the
+        # session's adaptive limiter when send_rate is set
+        is_send = self.is_send_endpoint(endpoint)
+        limiter = self.limiter if is_send else None
+        attempt = 0
+
+        # the trial call of a half-open circuit is always settled, even if something other than the
+        # request itself raises, so the circuit can never be left waiting on it
+        try:
+            while True:
+                if limiter:
+                    limiter.acquire()
+                started = time.perf_counter()
                 try:
-                    result = response.json()
-                    # Convert WWebJS {success: bool} to WPPConnect {ok: bool}
-                    if "success" in result:
-                        result["ok"] = result["success"]
-                    self.logger.debug(f"Response data: {result}")
-                    return result
-                except Exception:
-                    self.logger.warning("Response is not JSON, returning raw content")
-                    return {"ok": True, "raw": response.content}
-            self.logger.info("Response has no content")
-            return {"ok": True, "no_content": True}
-        except requests.Timeout:
-            self.logger.error(f"WWebJS request timed out after {self.timeout} seconds.")
-            return {"ok": False, "error": f"Timeout after {self.timeout} seconds"}
-        except requests.RequestException as e:
-            self.logger.error(f"WWebJS request error: {str(e)}")
-            return {"ok": False, "error": str(e)}
+                    response = requests.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        json=json_payload,
+                        data=body,
+                        params=params,
+                        timeout=self.timeout,
+                    )
+                    self.logger.debug(f"Response status: {response.status_code}")
+                    if is_send and is_throttled(response.status_code, response.text):
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                        if limiter:
+                            limiter.on_throttle(retry_after)
+                        if attempt < self.send_retries:
+                            record_gateway_call(
+                                "WWebJS", label, method, "throttled", started, response
+                            )
+                            attempt += 1
+                            delay = backoff_delay(attempt)
+                            if not limiter and retry_after:
+                                # without a limiter to hold sends back, the gateway's hint is waited out here
+                                delay = max(delay, min(retry_after, 30.0))
+                            self.logger.warning(
+                                f"WWebJS throttled {endpoint} (HTTP {response.status_code}), "
+                                f"retry {attempt}/{self.send_retries} in {delay:.2f}s"
+                            )
+                            time.sleep(delay)
+                            continue
+                    response.raise_for_status()
+                    record_gateway_call(
+                        "WWebJS", label, method, "ok", started, response
+                    )
+                    if breaker:
+                        breaker.record_success()
+                    if limiter:
+                        limiter.on_success()
+                    if response.content:
+                        try:
+                            result = response.json()
+                            # Convert WWebJS {success: bool} to WPPConnect {ok: bool}
+                            if "success" in result:
+                                result["ok"] = result["success"]
+                            self.logger.debug(f"Response data: {result}")
+                            return result
+                        except Exception:
+                            self.logger.warning(
+                                "Response is not JSON, returning raw content"
+                            )
+                            return {"ok": True, "raw": response.content}
+                    self.logger.debug("Response has no content")
+                    return {"ok": True, "no_content": True}
+                except requests.HTTPError as e:
+                    record_gateway_call(
+                        "WWebJS",
+                        label,
+                        method,
+                        (
+                            http_outcome(e.response.status_code)
+                            if e.response is not None
+                            else "error"
+                        ),
+                        started,
+                        e.response,
+                    )
+                    # the gateway answered, so only server errors count against the circuit
+                    if breaker:
+                        if e.response is not None and e.response.status_code >= 500:
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success()
+                    self.logger.error(f"WWebJS request error: {str(e)}")
+                    return {"ok": False, "error": str(e)}
+                except requests.Timeout:
+                    record_gateway_call("WWebJS", label, method, "timeout", started)
+                    if breaker:
+                        breaker.record_failure()
+                    self.logger.error(
+                        f"WWebJS request timed out after {self.timeout} seconds."
+                    )
+                    return {
+                        "ok": False,
+                        "error": f"Timeout after {self.timeout} seconds",
+                    }
+                except requests.RequestException as e:
+                    record_gateway_call("WWebJS", label, method, "error", started)
+                    if breaker:
+                        breaker.record_failure()
+                    self.logger.error(f"WWebJS request error: {str(e)}")
+                    return {"ok": False, "error": str(e)}
+        finally:
+            if breaker:
+                breaker.release_trial()
+
+    def is_probe_endpoint(self, endpoint: str) -> bool:
+        """Returns True if the endpoint is a connection check allowed through an open circuit."""
+        return endpoint.lstrip("/").startswith(self.PROBE_ENDPOINT_PREFIXES)
+
+    def is_send_endpoint(self, endpoint: str) -> bool:
+        """Returns True if the endpoint delivers a message and is subject to send rate limiting."""
+        return endpoint.lstrip("/").startswith(self.SEND_ENDPOINT_PREFIXES)
 
     # Utility methods (static, same as WPPConnect)
 
+    # client events reported by WWebJS mapped to session status
+    SESSION_STATUS_EVENTS = {
+        "qr": "QRCODE",
+        "authenticated": "CONNECTED",
+        "ready": "CONNECTED",
+        "disconnected": "DISCONNECTED",
+        "auth_failure": "UNPAIRED",
+    }
+
+    def parse_session_event(self, request: dict) -> dict:
+        """
+        Parses a session-state webhook payload (qr, authenticated, ready, disconnected, change_state).
+
+        Returns session state fields ("status", and "qrcode" when a new QR code was issued), or an
+        empty dict if the payload is not a session-state event. The qr event only carries the raw
+        QR string, so the QR image is fetched from the gateway and returned as base64, the same
+        shape the WPPConnect client reports; "qrcode" is blank if the image could not be fetched.
+        """
+        data_type = request.get("dataType")
+        data = request.get("data") or {}
+        if data_type == "change_state":
+            state = str(data.get("state", "")).upper()
+            return {"status": state} if state else {}
+        status = WWebJSAPI.SESSION_STATUS_EVENTS.get(data_type or "")
+        if not status:
+            return {}
+        if data_type == "qr":
+            return {"status": status, "qrcode": self.qrcode().get("qrcode") or ""}
+        return {"status": status}
+
+    @staticmethod
+    def get_webhook_session(request: dict) -> str:
+        """Returns the name of the WWebJS session a webhook payload was sent for, or "" if it is not given."""
+        return str(request.get("sessionId") or "")
+
     @staticmethod
     def parse_inbound_message(request: dict) -> dict:
         """Parses an inbound message request payload and returns extracted values."""
@@ -415,126 +595,153 @@ class WWebJSAPI:
         webhook_url: str = "",
         wait_qr_code: bool = True,
         auto_register: bool = True,
+        status_resp: Optional[dict] = None,
     ) -> dict:
         """
-        Initializes the WWebJS session with optional custom webhook URL.
+        Initializes the WWebJS session with optional custom webhook URL, running every registration step in turn.
         If webhook_url is provided, it will be set for this specific session.
+        A recent status response may be supplied to skip the initial status request.
         """
-        self.logger.info(
+        self.logger.debug(
             f"Starting register_session with webhook_url={webhook_url}, wait_qr_code={wait_qr_code}, auto_register={auto_register}"
         )
-        self.logger.info(f"Using session: {self.session}, API URL: {self.api_url}")
-        self.logger.info(f"Secret key available: {bool(self.secret_key)}")
+        return registration.run_registration(
+            self,
+            webhook_url=webhook_url,
+            wait_qr_code=wait_qr_code,
+            auto_register=auto_register,
+            status_resp=status_resp,
+        )
 
-        status_resp = self.status()
-        self.logger.info(f"Initial status response: {status_resp}")
+    def registration_step(
+        self,
+        state: dict,
+        webhook_url: str = "",
+        status_resp: Optional[dict] = None,
+        max_attempts: int = 3,
+        retry_delay: float = 2.0,
+    ) -> dict:
+        """
+        Runs the registration step named by state["step"] and returns the next state.
 
-        # Check both 'state' (WWebJS) and 'status' (for test compatibility)
-        state = (status_resp.get("state") or status_resp.get("status", "")).upper()
-        self.logger.info(f"Detected state: {state}")
+        In WWebJS creating a session starts it, so GENERATE_TOKEN registers the webhook too.
+        """
+        step = state.get("step", registration.CHECK_STATUS)
+        self.logger.debug(f"Registration step {step} for session: {self.session}")
 
-        # Check for unauthorized/error - try to create session (regardless of auto_register)
-        # This matches WPPConnect behavior where create_session is called for auth errors
-        if "error" in status_resp or "Unauthorized" in str(
-            status_resp.get("error", "")
-        ):
-            self.logger.warning(
-                f"Unauthorized or error detected: {status_resp.get('error', 'Unknown error')}"
-            )
-            self.logger.info("Attempting to create session...")
-            create_res = self.create_session(webhook=webhook_url)
-            self.logger.info(f"Create session response: {create_res}")
+        if step == registration.CHECK_STATUS:
+            if status_resp is None:
+                status_resp = self.status()
+            # Check both 'state' (WWebJS) and 'status' (for test compatibility)
+            status = (status_resp.get("state") or status_resp.get("status", "")).upper()
 
-            if not create_res.get("ok"):
-                self.logger.error("Failed to create session")
-                return {
-                    "status": "ERROR",
-                    "message": "Could not create instance.",
-                    "details": create_res,
-                }
+            # Check for unauthorized/error - try to create session (regardless of auto_register)
+            if "error" in status_resp and not state.get("token_generated"):
+                self.logger.warning(
+                    f"Unauthorized or error detected: {status_resp.get('error', 'Unknown error')}"
+                )
+                return registration.next_state(state, registration.GENERATE_TOKEN)
 
-            # Try status again
-            self.logger.info("Checking status again after session creation...")
-            status_resp = self.status()
-            state = (status_resp.get("state") or status_resp.get("status", "")).upper()
-            self.logger.info(f"Status after session creation: {state}")
+            if status == "CONNECTED":
+                return registration.next_state(
+                    state, registration.FETCH_DEVICE, status=status
+                )
+            if status in {"QRCODE", "DISCONNECTED", "UNPAIRED", ""} and state.get(
+                "auto_register", True
+            ):
+                return registration.next_state(
+                    state, registration.START_SESSION, status=status
+                )
 
-        if state == "CONNECTED":
-            self.logger.info("Session is already connected, getting device info...")
-            device_info = self.get_host_device()
-            return {
-                "status": "CONNECTED",
-                "message": "Session is already active and connected.",
-                "device": device_info,
-                "session": self.session,
-                "token": self.token,  # Keep for compatibility
+            self.logger.warning(f"Unexpected state: {status}, returning status")
+            unexpected = {
+                "status": status,
+                "message": f"Session status: {status}",
+                "details": status_resp,
             }
-        elif state in {"QRCODE", "DISCONNECTED", "UNPAIRED", ""} and auto_register:
-            self.logger.info(
-                f"Session state requires registration: {state}, starting session..."
+            # States that might need a QR code still return one, even when auto_register=False
+            if status in {"QRCODE", "DISCONNECTED", "UNPAIRED"}:
+                return registration.next_state(
+                    state, registration.FETCH_QRCODE, **unexpected
+                )
+            return registration.next_state(state, registration.DONE, **unexpected)
+
+        if step == registration.GENERATE_TOKEN:
+            create_res = self.create_session(webhook=webhook_url)
+            if not create_res.get("ok"):
+                self.logger.error("Failed to create session")
+                return registration.next_state(
+                    state,
+                    registration.FAILED,
+                    status="ERROR",
+                    message="Could not create instance.",
+                    details=create_res,
+                )
+            return registration.next_state(
+                state, registration.CHECK_STATUS, token_generated=True
             )
+
+        if step == registration.START_SESSION:
+            wait_qr_code = state.get("wait_qr_code", True)
             start_res = self.start_session(
                 webhook=webhook_url, wait_qr_code=wait_qr_code
             )
-            self.logger.info(f"Start session response: {start_res}")
-
-            # If wait_qr_code is True, the QR code should already be in start_res
-            if wait_qr_code and start_res.get("qrcode_base64"):
-                self.logger.info("Using QR code from start_session response")
-                qrcode_b64 = start_res.get("qrcode_base64")
-            else:
-                self.logger.info("Getting QR code separately...")
-                # Fallback: get QR code separately
-                qr_resp = self.qrcode()
-                qrcode_b64 = (
-                    qr_resp.get("qrcode_base64")
-                    or qr_resp.get("qr")
-                    or qr_resp.get("qrcode")
+            if not start_res.get("ok", True):
+                return registration.retry_state(
+                    state,
+                    str(start_res.get("error") or "session start failed"),
+                    max_attempts=max_attempts,
+                    retry_delay=retry_delay,
                 )
-                self.logger.info(f"QR code response: {qr_resp}")
-
-            return {
+            awaiting = {
                 "status": "AWAITING_QR_SCAN",
                 "message": "Session created or started. Awaiting QR Code scan.",
-                "qrcode": qrcode_b64,
                 "session": self.session,
-                "token": self.token,  # Keep for compatibility
             }
+            # If wait_qr_code is True, the QR code should already be in start_res
+            if wait_qr_code and start_res.get("qrcode_base64"):
+                return registration.next_state(
+                    state,
+                    registration.AWAITING_SCAN,
+                    qrcode=start_res.get("qrcode_base64"),
+                    **awaiting,
+                )
+            return registration.next_state(state, registration.FETCH_QRCODE, **awaiting)
 
-        self.logger.warning(f"Unexpected state: {state}, returning status")
-
-        # For states that might need QR code (like QRCODE, DISCONNECTED), try to get QR code
-        # This matches the old WPPConnect behavior where QR code is returned even when auto_register=False
-        qrcode_b64 = None
-        if state in {"QRCODE", "DISCONNECTED", "UNPAIRED"}:
-            self.logger.info(
-                f"State {state} might need QR code, attempting to get it..."
-            )
+        if step == registration.FETCH_QRCODE:
             qr_resp = self.qrcode()
-            if qr_resp.get("ok"):
-                qrcode_b64 = qr_resp.get("qrcode_base64") or qr_resp.get("qrcode")
-                self.logger.info("Successfully retrieved QR code for fallback case")
-            else:
+            qrcode_b64 = (
+                qr_resp.get("qrcode_base64")
+                or qr_resp.get("qr")
+                or qr_resp.get("qrcode")
+            )
+            if not qrcode_b64:
                 self.logger.warning(
-                    f"Failed to get QR code for state {state}: {qr_resp.get('error')}"
+                    f"Failed to get QR code: {qr_resp.get('error', 'Unknown error')}"
                 )
+            return registration.next_state(
+                state,
+                registration.AWAITING_SCAN if qrcode_b64 else registration.DONE,
+                qrcode=qrcode_b64,
+            )
 
-        result = {
-            "status": state,
-            "message": f"Session status: {state}",
-            "details": status_resp,
-        }
-
-        if qrcode_b64:
-            result["qrcode"] = qrcode_b64
+        if step == registration.FETCH_DEVICE:
+            return registration.next_state(
+                state,
+                registration.CONNECTED,
+                status="CONNECTED",
+                message="Session is already active and connected.",
+                device=self.get_host_device(),
+                session=self.session,
+            )
 
-        return result
+        return state
 
     # 1. Instance/session related
 
     def status(self) -> dict:
         """GET /session/status/{sessionId}"""
-        self.logger.info(f"Checking status for session: {self.session}")
+        self.logger.debug(f"Checking status for session: {self.session}")
         result = self.send_rest_request(f"session/status/{self.session}", method="GET")
 
         # Normalize WWebJS response to WPPConnect format
@@ -548,23 +755,23 @@ class WWebJSAPI:
         if message == "session_not_found":
             # Session doesn't exist - set empty status to trigger creation
             result["status"] = ""
-            self.logger.info("Session not found, setting empty status")
+            self.logger.debug("Session not found, setting empty status")
         elif message in ["browser tab closed", "session closed"]:
             # Session is closed/dead - set empty status to trigger recreation
             result["status"] = ""
-            self.logger.info("Session closed, setting empty status")
+            self.logger.debug("Session closed, setting empty status")
         elif message == "session_not_connected":
             # Session exists but not connected - use the state value (QRCODE, DISCONNECTED, etc.)
             result["status"] = state if state else "DISCONNECTED"
-            self.logger.info(f"Session not connected, status: {result['status']}")
+            self.logger.debug(f"Session not connected, status: {result['status']}")
         elif message == "session_connected":
             # Session is connected
             result["status"] = "CONNECTED"
-            self.logger.info("Session is connected")
+            self.logger.debug("Session is connected")
         elif "state" in result and state:
             # Fallback: use state if available
             result["status"] = state
-            self.logger.info(f"Using state as status: {state}")
+            self.logger.debug(f"Using state as status: {state}")
         elif "error" in result and not result.get("ok"):
             # Handle error cases - set empty status so register_session can handle it
             result["status"] = ""
@@ -576,78 +783,81 @@ class WWebJSAPI:
                 f"Unknown status, setting empty. Message: {message}, State: {state}"
             )
 
-        self.logger.info(f"Final status result: {result}")
+        self.logger.debug(f"Final status result: {result}")
         return result
 
     def show_all_sessions(self) -> dict:
         """GET /session/getSessions"""
-        self.logger.info("Getting all sessions")
+        self.logger.debug("Getting all sessions")
         return self.send_rest_request("session/getSessions", method="GET")
 
     def check_connection(self) -> dict:
         """GET /client/getState/{sessionId}"""
-        self.logger.info(f"Checking connection state for session: {self.session}")
+        self.logger.debug(f"Checking connection state for session: {self.session}")
         response = self.send_rest_request(
             f"client/getState/{self.session}", method="GET"
         )
-        return {"status": response.get("success"), "message": response.get("state")}
+        return {
+            "status": response.get("success"),
+            "message": response.get("state") or response.get("error"),
+        }
 
     def start_session(self, webhook: str = "", wait_qr_code: bool = False) -> dict:
         """POST /session/start/{sessionId} with optional webhook URL"""
-        self.logger.info(
+        self.logger.debug(
             f"Starting session {self.session} with webhook={webhook}, wait_qr_code={wait_qr_code}"
         )
 
         if webhook:
             # Use POST with webhook URL in body
             data = {"webhookUrl": webhook}
-            self.logger.info(f"Using POST with webhook data: {data}")
-            self.logger.info(f"Sending webhook URL '{webhook}' to WWebJS API")
+            self.logger.debug(f"Using POST with webhook data: {data}")
+            self.logger.debug(f"Sending webhook URL '{webhook}' to WWebJS API")
             result = self.send_rest_request(
                 f"session/start/{self.session}", method="POST", data=data
             )
         else:
             # Use GET for backwards compatibility
-            self.logger.info(
+            self.logger.debug(
                 "Using GET for backwards compatibility (no webhook URL provided)"
             )
             result = self.send_rest_request(
                 f"session/start/{self.session}", method="GET"
             )
 
-        self.logger.info(f"Start session response: {result}")
+        self.logger.debug(f"Start session response: {result}")
 
         # Handle wait_qr_code parameter for backward compatibility
         if wait_qr_code and result.get("ok", True):
-            self.logger.info("wait_qr_code=True, getting QR code...")
+            self.logger.debug("wait_qr_code=True, getting QR code...")
             # Get QR code and merge it into the result
             qr_result = self.qrcode()
             if qr_result.get("ok"):
                 result["qrcode_base64"] = qr_result.get("qrcode_base64")
                 result["qrcode"] = qr_result.get("qrcode")
-                self.logger.info("Successfully added QR code to response")
+                self.logger.debug("Successfully added QR code to response")
             else:
                 # If QR code fails, still return the start result but log the error
                 self.logger.warning(
                     f"Failed to get QR code: {qr_result.get('error', 'Unknown error')}"
                 )
 
-        self.logger.info(f"Final start_session result: {result}")
+        self.logger.debug(f"Final start_session result: {result}")
         return result
 
     def close_session(self) -> dict:
         """GET /session/stop/{sessionId}"""
-        self.logger.info(f"Closing session: {self.session}")
+        self.logger.debug(f"Closing session: {self.session}")
         return self.send_rest_request(f"session/stop/{self.session}", method="GET")
 
     def logout_session(self) -> None:
         """GET /session/terminate/{sessionId}"""
-        self.logger.info(f"Logging out session: {self.session}")
+        self.logger.debug(f"Logging out session: {self.session}")
         self.send_rest_request(f"session/terminate/{self.session}", method="GET")
 
     def qrcode(self) -> dict:
         """GET /session/qr/{sessionId}/image - Returns QR code as base64 image"""
-        self.logger.info(f"Getting QR code for session: {self.session}")
+        self.logger.debug(f"Getting QR code for session: {self.session}")
         try:
             # Get QR code as PNG image
             response = self.send_rest_request(
@@ -656,7 +866,7 @@ class WWebJSAPI:
 
             # Convert image to base64
             qr_base64 = base64.b64encode(response["raw"]).decode("ascii")
-            self.logger.info(f"Successfully encoded QR code, length: {len(qr_base64)}")
+            self.logger.debug(f"Successfully encoded QR code, length: {len(qr_base64)}")
             return {"ok": True, "qrcode_base64": qr_base64, "qrcode": qr_base64}
         except Exception as e:
             self.logger.error(f"Failed to get QR code: {str(e)}")
@@ -664,7 +874,7 @@ class WWebJSAPI:
 
     def get_host_device(self) -> dict:
         """GET /client/getClassInfo/{sessionId}"""
-        self.logger.info(f"Getting host device info for session: {self.session}")
+        self.logger.debug(f"Getting host device info for session: {self.session}")
         result = self.send_rest_request(
             f"client/getClassInfo/{self.session}", method="GET"
         )
@@ -681,17 +891,17 @@ class WWebJSAPI:
                 "mapper": "device",
             }
 
-        self.logger.info(f"Host device info: {result}")
+        self.logger.debug(f"Host device info: {result}")
         return result
 
     def profile_exists(self) -> dict:
         """Not directly supported in WWebJS"""
-        self.logger.info("profile_exists called - not supported in WWebJS")
+        self.logger.debug("profile_exists called - not supported in WWebJS")
         return {"ok": False, "error": "profile_exists not supported in WWebJS"}
 
     def create_session(self, webhook: str = "") -> dict:
         """POST /session/start/{sessionId} with optional webhook URL - Start/create session in WWebJS"""
-        self.logger.info(f"Creating session {self.session} with webhook={webhook}")
+        self.logger.debug(f"Creating session {self.session} with webhook={webhook}")
 
         if not self.secret_key:
             # For compatibility with WPPConnect tests
@@ -702,29 +912,29 @@ class WWebJSAPI:
         if webhook:
             # Use POST with webhook URL in body
             data = {"webhookUrl": webhook}
-            self.logger.info(f"Using POST with webhook data: {data}")
-            self.logger.info(f"Sending webhook URL '{webhook}' to WWebJS API")
+            self.logger.debug(f"Using POST with webhook data: {data}")
+            self.logger.debug(f"Sending webhook URL '{webhook}' to WWebJS API")
             result = self.send_rest_request(
                 f"session/start/{self.session}", method="POST", data=data
             )
         else:
             # Use GET for backwards compatibility
-            self.logger.info(
+            self.logger.debug(
                 "Using GET for backwards compatibility (no webhook URL provided)"
             )
             result = self.send_rest_request(
                 f"session/start/{self.session}", method="GET"
             )
 
-        self.logger.info(f"Create session response: {result}")
+        self.logger.debug(f"Create session response: {result}")
 
         # Add token to response for compatibility
         if result.get("ok") or result.get("success"):
             result["token"] = self.token
             result["session"] = self.session
-            self.logger.info("Added token and session to response for compatibility")
+            self.logger.debug("Added token and session to response for compatibility")
 
-        self.logger.info(f"Final create_session result: {result}")
+        self.logger.debug(f"Final create_session result: {result}")
         return result
 
     # 2. Messaging
@@ -739,7 +949,7 @@ class WWebJSAPI:
     ) -> dict:
         """POST /client/sendMessage/{sessionId}"""
 
-        self.logger.info(
+        self.logger.debug(
             f"Sending message to {phone}, is_group={is_group}, message_id={message_id}"
         )
 
@@ -750,10 +960,10 @@ class WWebJSAPI:
         payload_options: dict = {}
         if message_id:
             payload_options["quotedMessageId"] = message_id
-            self.logger.info(f"Adding quoted message ID: {message_id}")
+            self.logger.debug(f"Adding quoted message ID: {message_id}")
         elif options:
             payload_options = options
-            self.logger.info(f"Adding custom options: {options}")
+            self.logger.debug(f"Adding custom options: {options}")
 
         # Construct payload
         data = {
@@ -765,14 +975,14 @@ class WWebJSAPI:
 
         self.logger.debug(f"Sending message data: {data}")
         result = self.send_rest_request(f"client/sendMessage/{self.session}", data=data)
-        self.logger.info(f"Send message result: {result}")
+        self.logger.debug(f"Send message result: {result}")
         return result
 
     def send_reply(
         self, phone: str, message: str, message_id: str, is_group: bool = False
     ) -> dict:
         """POST /client/sendMessage/{sessionId} with quotedMessageId"""
-        self.logger.info(
+        self.logger.debug(
             f"Sending reply to {phone}, message_id={message_id}, is_group={is_group}"
         )
         return self.send_message(phone, message, is_group, message_id=message_id)
@@ -941,12 +1151,21 @@ class WWebJSAPI:
         }
 
         # Send the REST request
-        return self.send_rest_request(f"client/sendMessage/{self.session}", data=data)
+        result = self.send_rest_request(f"client/sendMessage/{self.session}", data=data)
+
+        # report status like WPPConnect so callers can treat both gateways alike
+        result["status"] = "success" if result.get("success") else "fail"
+        return result
 
     def send_voice_base64(
-        self, phone: str, base64_ptt: str, is_group: bool = False
+        self, phone: str, base64_ptt: str, is_group: bool = False, mime_type: str = ""
     ) -> dict:
-        """POST /client/sendMessage/{sessionId} with MessageMedia as voice"""
+        """
+        POST /client/sendMessage/{sessionId} with MessageMedia as voice
+
+        Args:
+            mime_type: MIME type of the audio; defaults to MP3
+        """
         chat_id = self._format_chat_id(phone, is_group)
 
         # Remove data URI prefix if present
@@ -957,9 +1176,9 @@ class WWebJSAPI:
             "chatId": chat_id,
             "contentType": "MessageMedia",
             "content": {
-                "mimetype": "audio/mp3;",
+                "mimetype": mime_type or "audio/mp3;",
                 "data": base64_ptt,
-                "filename": "voice.mp3",
+                "filename": "voice.ogg" if "ogg" in mime_type else "voice.mp3",
             },
             "options": {"sendAudioAsVoice": True},
         }
@@ -1376,14 +1595,14 @@ class WWebJSAPI:
 
     def health_check(self) -> dict:
         """GET /ping - WWebJS uses ping instead of healthz"""
-        self.logger.info("Performing health check")
+        self.logger.debug("Performing health check")
         result = self.send_rest_request("ping", method="GET")
-        self.logger.info(f"Health check result: {result}")
+        self.logger.debug(f"Health check result: {result}")
         return result
 
     def get_metrics(self) -> dict:
         """Not supported in WWebJS"""
-        self.logger.info("get_metrics called - not supported in WWebJS")
+        self.logger.debug("get_metrics called - not supported in WWebJS")
         return {"ok": False, "error": "get_metrics not supported in WWebJS"}
 
     @staticmethod